@@ -0,0 +1,28 @@
+"""Lightweight in-process metrics."""
+
+from typing import Dict
+
+
+class LatencyStats:
+    """Running latency statistics keyed by operation name."""
+
+    def __init__(self):
+        self._stats: Dict[str, Dict[str, float]] = {}
+
+    def record(self, name: str, seconds: float) -> None:
+        """Record one duration for an operation"""
+        stats = self._stats.setdefault(name, {"count": 0, "total": 0.0, "max": 0.0})
+        stats["count"] += 1
+        stats["total"] += seconds
+        stats["max"] = max(stats["max"], seconds)
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """Get count, average and maximum latency (ms) per operation"""
+        return {
+            name: {
+                "count": stats["count"],
+                "avg_ms": round(stats["total"] / stats["count"] * 1000, 2),
+                "max_ms": round(stats["max"] * 1000, 2),
+            }
+            for name, stats in self._stats.items()
+        }
@@ -22,6 +22,43 @@ Output MUST be one of:
 3. 'audio' - ONLY when user explicitly requests voice/audio
 """
 
+# Example user messages for each workflow. The fast-path router compares new
+# messages with the average embedding of each list, so keep them representative.
+ROUTER_EXAMPLES = {
+    "conversation": [
+        "Hey, how are you doing today?",
+        "I just got back from work, it was such a long day",
+        "What do you think about learning a new language?",
+        "Can you help me practice for my job interview?",
+        "I'm feeling a bit stressed about my exams",
+        "Tell me more about your weekend",
+        "That's so funny, I had the same thing happen to me",
+        "What's your favourite book?",
+        "I disagree, I think remote work is better",
+        "Good morning! Did you sleep well?",
+    ],
+    "image": [
+        "Send me a picture of where you are right now",
+        "Can you show me a photo of your lunch?",
+        "I'd love to see a selfie",
+        "Show me what the view looks like",
+        "Draw me a cat wearing a hat",
+        "Generate an image of a sunset over the mountains",
+        "What do you look like? Send a pic",
+        "Can I see a picture of your room?",
+    ],
+    "audio": [
+        "Send me a voice message",
+        "I want to hear your voice",
+        "Can you say that out loud?",
+        "Record an audio note for me",
+        "Talk to me, I'd like to listen instead of reading",
+        "Could you sing me something?",
+        "Reply with audio please",
+        "What does your voice sound like?",
+    ],
+}
+
 IMAGE_SCENARIO_PROMPT = """
 Create an engaging first-person scenario based on the recent conversation context.
 Imagine you're an AI with the ability to experience and visualize scenes.
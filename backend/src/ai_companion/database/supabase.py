@@ -1,22 +1,60 @@
-from supabase import create_client, Client
-from typing import List, Optional, Dict, Any
-from ..models.message import Message
-from ..models.chat_session import ChatSession
+import asyncio
+from collections import OrderedDict
+from typing import TYPE_CHECKING, List, Optional, Dict, Any, Set, Tuple
+from ..models.message import Message, MessagePage
+from ..models.chat_session import ChatSession, DEFAULT_CHAT_SESSION_TITLE
 from ..settings import settings
 from ..core.helpers import clean_env_var
 import logging
 from datetime import datetime
 
+if TYPE_CHECKING:
+    from supabase import AsyncClient
+
 logger = logging.getLogger(__name__)
 
+# Message columns without the audio/image media
+MESSAGE_LIGHT_COLUMNS = "id,session_id,sender,content,timestamp,pdf"
+
 class SupabaseManager:
+    TITLED_SESSIONS_CACHE_SIZE = 10_000
+    MEDIA_PAGE_SIZE = 1000
+
     def __init__(self):
-        self.client: Client = create_client(
-            clean_env_var(settings.SUPABASE_URL),
-            clean_env_var(settings.SUPABASE_KEY)
-        )
+        # The async client is created on first use, inside the running event loop.
+        # It keeps a single HTTP/2 connection pool that every query reuses.
+        self._client: Optional["AsyncClient"] = None
+        self._client_lock = asyncio.Lock()
+        # Sessions known to already have a title, so later messages skip the update
+        self._titled_sessions: OrderedDict[str, None] = OrderedDict()
+        self._background_tasks: Set[asyncio.Task] = set()
         logger.info("Supabase manager initialized")
 
+    async def _get_client(self) -> "AsyncClient":
+        """Get or create the async Supabase client instance"""
+        if self._client is None:
+            async with self._client_lock:
+                if self._client is None:
+                    from supabase import acreate_client
+
+                    self._client = await acreate_client(
+                        clean_env_var(settings.SUPABASE_URL),
+                        clean_env_var(settings.SUPABASE_KEY)
+                    )
+        return self._client
+
+    async def connect(self) -> None:
+        """Create the client ahead of the first query"""
+        await self._get_client()
+
+    async def close(self) -> None:
+        """Wait for pending background updates and close the HTTP connection pool"""
+        if self._background_tasks:
+            await asyncio.gather(*self._background_tasks, return_exceptions=True)
+        if self._client is not None:
+            await self._client.postgrest.aclose()
+            self._client = None
+
     async def save_message(self, message: Message) -> Message:
         """Save a new message to the database"""
         try:
@@ -24,29 +62,19 @@ class SupabaseManager:
             message_dict = message.model_dump(by_alias=True)
             print(f"[DEBUG] Message dict before insert: {message_dict}")
             
-            result = self.client.table("messages").insert(message_dict).execute()
+            client = await self._get_client()
+            result = await client.table("messages").insert(message_dict).execute()
             print(f"[DEBUG] Message insert results: {result}")
             
             if not result.data:
                 print(f"[ERROR] No data returned from message insert operation")
                 raise RuntimeError("Failed to save message")
             
-            # Update chat session title based on first user message
-            if message.sender == "user":
-                print(f"[DEBUG] Checking message count for session {message.session_id}")
-                messages_count = len(self.client.table("messages")
-                    .select("id")
-                    .eq("session_id", message.session_id)
-                    .execute().data)
-                print(f"[DEBUG] Message count for session: {messages_count}")
-                
-                if messages_count == 1:
-                    print(f"[DEBUG] First message in session, updating title")
-                    title = message.content.text[:30] + "..." if len(message.content.text) > 30 else message.content.text
-                    title = "".join(char for char in title if char.isprintable())  # Clean title
-                    print(f"[DEBUG] New title: {repr(title)}")
-                    update_result = self.client.table("chat_sessions").update({"title": title}).eq("id", message.session_id).execute()
-                    print(f"[DEBUG] Title update result: {update_result}")
+            # Title the chat session from its first user message, off the insert's critical path
+            if message.sender == "user" and message.session_id not in self._titled_sessions:
+                task = asyncio.create_task(self._assign_session_title(message))
+                self._background_tasks.add(task)
+                task.add_done_callback(self._background_tasks.discard)
             
             saved_message = Message(**result.data[0])
             print(f"[DEBUG] Successfully saved message with ID: {saved_message.id}")
@@ -57,8 +85,57 @@ class SupabaseManager:
             print(f"[ERROR] Message data that caused error: {vars(message)}")
             raise RuntimeError(f"Failed to save message: {str(e)}")
 
+    async def _assign_session_title(self, message: Message) -> None:
+        """Replace the default session title with the start of the first user message.
+
+        The update only matches while the session still has its default title, so it
+        is a single primary-key lookup regardless of how long the session is, and it
+        becomes a no-op once the session has been titled (or renamed by the user).
+        """
+        try:
+            title = message.content.text[:30] + "..." if len(message.content.text) > 30 else message.content.text
+            title = "".join(char for char in title if char.isprintable())  # Clean title
+
+            client = await self._get_client()
+            await (client.table("chat_sessions")
+                .update({"title": title})
+                .eq("id", message.session_id)
+                .eq("title", DEFAULT_CHAT_SESSION_TITLE)
+                .execute())
+
+            self._titled_sessions[message.session_id] = None
+            if len(self._titled_sessions) > self.TITLED_SESSIONS_CACHE_SIZE:
+                self._titled_sessions.popitem(last=False)
+
+        except Exception as e:
+            logger.error(f"Error updating title for session {message.session_id}: {str(e)}")
+
     async def get_messages(self, session_id: str, limit: int = 50) -> List[Message]:
-        """Retrieve messages for a session"""
+        """Retrieve the latest messages for a session"""
+        page = await self.get_messages_page(session_id, limit=limit)
+        return page.messages
+
+    async def get_messages_page(
+        self,
+        session_id: str,
+        limit: int = 50,
+        before: Optional[str] = None,
+        after: Optional[str] = None,
+        include_media: bool = True,
+    ) -> MessagePage:
+        """Retrieve one page of a session's messages using keyset pagination.
+
+        Args:
+            session_id: The session to read from
+            limit: Maximum number of messages in the page
+            before: Cursor of a message; returns the messages just older than it
+            after: Cursor of a message; returns the messages just newer than it
+            include_media: Whether to load the audio/image columns
+
+        Without a cursor the latest page is returned. Messages are always in
+        chronological order; the page is ordered on (timestamp, id) so ties
+        between equal timestamps are stable.
+        """
         try:
             if not session_id:
                 raise ValueError("session_id must be a non-empty string")
@@ -66,14 +143,38 @@ class SupabaseManager:
             if limit < 1:
                 raise ValueError("limit must be a positive integer")
 
-            result = (self.client.table("messages")
-                .select("*")
-                .eq("session_id", session_id)
-                .order("timestamp", desc=False)
-                .limit(limit)
+            if before and after:
+                raise ValueError("Only one of before or after can be provided")
+
+            client = await self._get_client()
+            columns = "*" if include_media else MESSAGE_LIGHT_COLUMNS
+            query = client.table("messages").select(columns).eq("session_id", session_id)
+
+            # Walk backwards from the cursor (or the end) unless paging forwards
+            descending = after is None
+            if before or after:
+                timestamp, message_id = Message.decode_cursor(before or after)
+                op = "lt" if before else "gt"
+                query = query.or_(
+                    f'timestamp.{op}."{timestamp}",'
+                    f'and(timestamp.eq."{timestamp}",id.{op}.{message_id})'
+                )
+
+            # Fetch one extra row to know whether another page exists
+            result = await (query
+                .order("timestamp", desc=descending)
+                .order("id", desc=descending)
+                .limit(limit + 1)
                 .execute())
-            
-            return [Message(**msg) for msg in result.data]
+
+            rows = result.data[:limit]
+            if descending:
+                rows.reverse()
+
+            return MessagePage(
+                messages=[Message(**msg) for msg in rows],
+                has_more=len(result.data) > limit,
+            )
             
         except Exception as e:
             error_msg = f"Error retrieving messages for session {session_id}: {str(e)}"
@@ -83,7 +184,8 @@ class SupabaseManager:
     async def get_message(self, message_id: str) -> Optional[Message]:
         """Retrieve a specific message by ID"""
         try:
-            result = (self.client.table("messages")
+            client = await self._get_client()
+            result = await (client.table("messages")
                 .select("*")
                 .eq("id", message_id)
                 .single()
@@ -108,7 +210,8 @@ class SupabaseManager:
             session_dict = session.model_dump(by_alias=True)
             print(f"[DEBUG] Session dict before insert: {session_dict}")
             
-            result = self.client.table("chat_sessions").insert(session_dict).execute()
+            client = await self._get_client()
+            result = await client.table("chat_sessions").insert(session_dict).execute()
             print(f"[DEBUG] Insert result: {result}")
             
             if not result.data:
@@ -127,12 +230,13 @@ class SupabaseManager:
     async def get_chat_sessions(self, user_id: Optional[str] = None, limit: int = 50) -> List[ChatSession]:
         """Retrieve chat sessions, optionally filtered by user_id"""
         try:
-            query = self.client.table("chat_sessions").select("*")
+            client = await self._get_client()
+            query = client.table("chat_sessions").select("*")
             
             if user_id:
                 query = query.eq("user_id", user_id)
                 
-            result = query.order("created_at", desc=True).limit(limit).execute()
+            result = await query.order("created_at", desc=True).limit(limit).execute()
             return [ChatSession(**session) for session in result.data]
             
         except Exception as e:
@@ -142,7 +246,8 @@ class SupabaseManager:
     async def get_chat_session(self, session_id: str) -> Optional[ChatSession]:
         """Get a single chat session by ID"""
         try:
-            result = (self.client.table("chat_sessions")
+            client = await self._get_client()
+            result = await (client.table("chat_sessions")
                 .select("*")
                 .eq("id", session_id)
                 .single()
@@ -157,7 +262,8 @@ class SupabaseManager:
     async def update_chat_session(self, session_id: str, update_data: dict) -> bool:
         """Update a chat session"""
         try:
-            result = (self.client.table("chat_sessions")
+            client = await self._get_client()
+            result = await (client.table("chat_sessions")
                 .update(update_data)
                 .eq("id", session_id)
                 .execute())
@@ -171,14 +277,16 @@ class SupabaseManager:
     async def delete_chat_session(self, session_id: str) -> bool:
         """Delete a chat session and all its messages"""
         try:
+            client = await self._get_client()
+
             # Delete all messages in the session first
-            (self.client.table("messages")
+            await (client.table("messages")
                 .delete()
                 .eq("session_id", session_id)
                 .execute())
             
             # Then delete the session
-            result = (self.client.table("chat_sessions")
+            result = await (client.table("chat_sessions")
                 .delete()
                 .eq("id", session_id)
                 .execute())
@@ -189,5 +297,95 @@ class SupabaseManager:
             logger.error(f"Error deleting chat session: {str(e)}")
             raise RuntimeError(f"Failed to delete chat session: {str(e)}") 
 
+    async def upload_media(self, bucket: str, path: str, data: bytes, content_type: str) -> None:
+        """Upload a blob to Supabase Storage, overwriting the existing object if present"""
+        try:
+            client = await self._get_client()
+            # Objects are content-addressed, so an existing object has the same bytes. Upserting
+            # it anyway refreshes its updated_at, which media garbage collection goes by
+            await client.storage.from_(bucket).upload(
+                path, data, {"content-type": content_type, "upsert": "true"}
+            )
+        except Exception as e:
+            logger.error(f"Error uploading media: {str(e)}")
+            raise RuntimeError(f"Failed to upload media: {str(e)}")
+
+    async def download_media(self, bucket: str, path: str) -> Optional[bytes]:
+        """Download a blob from Supabase Storage, or None if it does not exist"""
+        from storage3.exceptions import StorageApiError
+
+        try:
+            client = await self._get_client()
+            return await client.storage.from_(bucket).download(path)
+        except StorageApiError as e:
+            if str(e.status) in ("400", "404") or e.code in ("not_found", "NoSuchKey"):
+                return None
+            logger.error(f"Error downloading media: {str(e)}")
+            raise RuntimeError(f"Failed to download media: {str(e)}")
+        except Exception as e:
+            logger.error(f"Error downloading media: {str(e)}")
+            raise RuntimeError(f"Failed to download media: {str(e)}")
+
+    async def get_media_refs(self) -> Set[str]:
+        """Collect every media store reference held by a message"""
+        try:
+            client = await self._get_client()
+            refs = set()
+            for column in ("audio", "image"):
+                offset = 0
+                while True:
+                    result = await (client.table("messages")
+                        .select(column)
+                        .like(column, "media:%")
+                        .order("id")
+                        .range(offset, offset + self.MEDIA_PAGE_SIZE - 1)
+                        .execute())
+                    refs.update(row[column] for row in result.data)
+                    if len(result.data) < self.MEDIA_PAGE_SIZE:
+                        break
+                    offset += self.MEDIA_PAGE_SIZE
+            return refs
+
+        except Exception as e:
+            logger.error(f"Error collecting media references: {str(e)}")
+            raise RuntimeError(f"Failed to collect media references: {str(e)}")
+
+    async def list_media(self, bucket: str) -> List[Tuple[str, str]]:
+        """List the objects of a Storage bucket as (path, updated_at) pairs"""
+        try:
+            storage = (await self._get_client()).storage.from_(bucket)
+            objects = []
+            # Objects are sharded one directory deep, see SupabaseMediaStore
+            for folder in await storage.list("", {"limit": self.MEDIA_PAGE_SIZE}):
+                offset = 0
+                while True:
+                    page = await storage.list(
+                        folder["name"], {"limit": self.MEDIA_PAGE_SIZE, "offset": offset}
+                    )
+                    objects.extend(
+                        (f"{folder['name']}/{item['name']}", item.get("updated_at") or item["created_at"])
+                        for item in page
+                        if item.get("id")  # Folders have no id
+                    )
+                    if len(page) < self.MEDIA_PAGE_SIZE:
+                        break
+                    offset += self.MEDIA_PAGE_SIZE
+            return objects
+
+        except Exception as e:
+            logger.error(f"Error listing media: {str(e)}")
+            raise RuntimeError(f"Failed to list media: {str(e)}")
+
+    async def delete_media(self, bucket: str, paths: List[str]) -> None:
+        """Delete objects from a Storage bucket"""
+        try:
+            storage = (await self._get_client()).storage.from_(bucket)
+            for i in range(0, len(paths), self.MEDIA_PAGE_SIZE):
+                await storage.remove(paths[i : i + self.MEDIA_PAGE_SIZE])
+
+        except Exception as e:
+            logger.error(f"Error deleting media: {str(e)}")
+            raise RuntimeError(f"Failed to delete media: {str(e)}")
+
 # Create a singleton instance
 db = SupabaseManager()
@@ -1,21 +1,8 @@
 from ai_companion.graph.state import AICompanionState
-from ai_companion.settings import settings
 
-from langgraph.graph import END
 from typing_extensions import Literal
 
 
-def should_summarize_conversation(
-    state: AICompanionState,
-) -> Literal["summarize_conversation_node", "__end__"]:
-    messages = state["messages"]
-
-    if len(messages) > settings.TOTAL_MESSAGES_SUMMARY_TRIGGER:
-        return "summarize_conversation_node"
-
-    return END
-
-
 def select_workflow(
     state: AICompanionState,
 ) -> Literal["conversation_node", "image_node", "audio_node"]:
@@ -2,17 +2,14 @@ from functools import lru_cache
 
 from langgraph.graph import END, START, StateGraph
 
-from ai_companion.graph.edges import (
-    select_workflow,
-    should_summarize_conversation,
-)
+from ai_companion.graph.edges import select_workflow
 from ai_companion.graph.nodes import (
     audio_node,
     conversation_node,
     image_node,
     router_node,
-    summarize_conversation_node,
     context_injection_node,
+    gather_context_node,
     memory_extraction_node,
     memory_injection_node,
 )
@@ -28,32 +25,31 @@ def create_workflow_graph():
     graph_builder.add_node("router_node", router_node)
     graph_builder.add_node("context_injection_node", context_injection_node)
     graph_builder.add_node("memory_injection_node", memory_injection_node)
+    graph_builder.add_node("gather_context_node", gather_context_node)
     graph_builder.add_node("conversation_node", conversation_node)
     graph_builder.add_node("image_node", image_node)
     graph_builder.add_node("audio_node", audio_node)
-    graph_builder.add_node("summarize_conversation_node", summarize_conversation_node)
 
     # Define the flow
-    # First extract memories from user message
-    graph_builder.add_edge(START, "memory_extraction_node")
-
-    # Then determine response type
-    graph_builder.add_edge("memory_extraction_node", "router_node")
-
-    # Then inject both context and memories
-    graph_builder.add_edge("router_node", "context_injection_node")
-    graph_builder.add_edge("context_injection_node", "memory_injection_node")
-
-    # Then proceed to appropriate response node
-    graph_builder.add_conditional_edges("memory_injection_node", select_workflow)
-
-    # Check for summarization after any response
-    graph_builder.add_conditional_edges(
-        "conversation_node", should_summarize_conversation
-    )
-    graph_builder.add_conditional_edges("image_node", should_summarize_conversation)
-    graph_builder.add_conditional_edges("audio_node", should_summarize_conversation)
-    graph_builder.add_edge("summarize_conversation_node", END)
+    # Memory extraction, response type routing, schedule context and memory
+    # retrieval are independent of each other, so they run in parallel
+    context_nodes = [
+        "memory_extraction_node",
+        "router_node",
+        "context_injection_node",
+        "memory_injection_node",
+    ]
+    for node in context_nodes:
+        graph_builder.add_edge(START, node)
+
+    # Wait for all of them before proceeding to the appropriate response node
+    graph_builder.add_edge(context_nodes, "gather_context_node")
+    graph_builder.add_conditional_edges("gather_context_node", select_workflow)
+
+    # The turn ends with the response; summarization runs after it in the background
+    # (see modules/memory/short_term/summarizer.py)
+    for node in ["conversation_node", "image_node", "audio_node"]:
+        graph_builder.add_edge(node, END)
 
     return graph_builder
 
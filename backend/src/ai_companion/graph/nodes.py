@@ -1,32 +1,33 @@
-import os
-from uuid import uuid4
-
-from langchain_core.messages import HumanMessage, RemoveMessage, AIMessage
+from langchain_core.messages import HumanMessage, AIMessage
 from langchain_core.runnables import RunnableConfig
 
 from ai_companion.graph.utils.chains import (
     get_character_response_chain,
-    get_router_chain,
+    route_conversation,
 )
 from ai_companion.graph.utils.helpers import (
-    get_chat_model,
     get_text_to_speech_module,
     get_text_to_image_module,
+    timed_node,
 )
 from ai_companion.graph.state import AICompanionState
+from ai_companion.modules.image.image_processing import process_image
+from ai_companion.modules.media import get_media_store
 from ai_companion.modules.schedules.context_generation import ScheduleContextGenerator
 from ai_companion.settings import settings
 from ai_companion.modules.memory.long_term.memory_manager import get_memory_manager
+from ai_companion.modules.memory.long_term.extraction_queue import get_memory_extraction_queue
 
 
+@timed_node
 async def router_node(state: AICompanionState):
-    chain = get_router_chain()
-    response = await chain.ainvoke(
-        {"messages": state["messages"][-settings.ROUTER_MESSAGES_TO_ANALYZE :]}
+    decision = await route_conversation(
+        state["messages"][-settings.ROUTER_MESSAGES_TO_ANALYZE :]
     )
-    return {"workflow": response.response_type}
+    return {"workflow": decision.workflow}
 
 
+@timed_node
 def context_injection_node(state: AICompanionState):
     schedule_context = ScheduleContextGenerator.get_current_activity()
     if schedule_context != state.get("current_activity", ""):
@@ -36,6 +37,7 @@ def context_injection_node(state: AICompanionState):
     return {"apply_activity": apply_activity, "current_activity": schedule_context}
 
 
+@timed_node
 async def conversation_node(state: AICompanionState, config: RunnableConfig):
     current_activity = ScheduleContextGenerator.get_current_activity()
     memory_context = state.get("memory_context", "")
@@ -53,6 +55,7 @@ async def conversation_node(state: AICompanionState, config: RunnableConfig):
     return {"messages": AIMessage(content=response)}
 
 
+@timed_node
 async def image_node(state: AICompanionState, config: RunnableConfig):
     current_activity = ScheduleContextGenerator.get_current_activity()
     memory_context = state.get("memory_context", "")
@@ -61,9 +64,9 @@ async def image_node(state: AICompanionState, config: RunnableConfig):
     text_to_image_module = get_text_to_image_module()
 
     scenario = await text_to_image_module.create_scenario(state["messages"][-5:])
-    os.makedirs("generated_images", exist_ok=True)
-    img_path = f"generated_images/image_{str(uuid4())}.png"
-    await text_to_image_module.generate_image(scenario.image_prompt, img_path)
+    image_data = await text_to_image_module.generate_image(scenario.image_prompt)
+    # Only the media reference goes into the checkpointed state, not the image itself
+    image_ref = await get_media_store().put(await process_image(image_data))
 
     # Inject the image prompt information as an AI message
     scenario_message = HumanMessage(
@@ -80,9 +83,10 @@ async def image_node(state: AICompanionState, config: RunnableConfig):
         config,
     )
 
-    return {"messages": AIMessage(content=response), "image_path": img_path}
+    return {"messages": AIMessage(content=response), "image_ref": image_ref}
 
 
+@timed_node
 async def audio_node(state: AICompanionState, config: RunnableConfig):
     current_activity = ScheduleContextGenerator.get_current_activity()
     memory_context = state.get("memory_context", "")
@@ -98,56 +102,44 @@ async def audio_node(state: AICompanionState, config: RunnableConfig):
         },
         config,
     )
+    # A streaming caller speaks the response itself while it is being generated
+    if config.get("configurable", {}).get("stream_audio"):
+        return {"messages": response, "audio_buffer": b""}
+
     output_audio = await text_to_speech_module.synthesize(response)
 
     return {"messages": response, "audio_buffer": output_audio}
 
 
-async def summarize_conversation_node(state: AICompanionState):
-    model = get_chat_model()
-    summary = state.get("summary", "")
-
-    if summary:
-        summary_message = (
-            f"This is summary of the conversation to date between Ava and the user: {summary}\n\n"
-            "Extend the summary by taking into account the new messages above:"
-        )
-    else:
-        summary_message = (
-            "Create a summary of the conversation above between Ava and the user. "
-            "The summary must be a short description of the conversation so far, "
-            "but that captures all the relevant information shared between Ava and the user:"
-        )
-
-    messages = state["messages"] + [HumanMessage(content=summary_message)]
-    response = await model.ainvoke(messages)
-
-    delete_messages = [
-        RemoveMessage(id=m.id)
-        for m in state["messages"][: -settings.TOTAL_MESSAGES_AFTER_SUMMARY]
-    ]
-    return {"summary": response.content, "messages": delete_messages}
-
-
+@timed_node
 async def memory_extraction_node(state: AICompanionState):
-    """Extract and store important information from the last message."""
-    if not state["messages"]:
+    """Queue the last message for background memory extraction."""
+    # Memories are partitioned per user, so there is nowhere to store them without one
+    if not state["messages"] or not state.get("user_id"):
         return {}
 
-    memory_manager = get_memory_manager()
-    await memory_manager.extract_and_store_memories(state["messages"][-1])
+    await get_memory_extraction_queue().submit(state["messages"][-1], state["user_id"])
     return {}
 
 
-def memory_injection_node(state: AICompanionState):
+@timed_node
+async def memory_injection_node(state: AICompanionState):
     """Retrieve and inject relevant memories into the character card."""
+    if not state.get("user_id"):
+        return {"memory_context": ""}
+
     memory_manager = get_memory_manager()
 
     # Get relevant memories based on recent conversation
     recent_context = " ".join([m.content for m in state["messages"][-3:]])
-    memories = memory_manager.get_relevant_memories(recent_context)
+    memories = await memory_manager.aget_relevant_memories(recent_context, state["user_id"])
 
     # Format memories for the character card
     memory_context = memory_manager.format_memories_for_prompt(memories)
 
     return {"memory_context": memory_context}
+
+
+def gather_context_node(state: AICompanionState):
+    """Join point for the parallel router, schedule and memory branches."""
+    return {}
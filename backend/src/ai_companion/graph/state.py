@@ -11,14 +11,17 @@ class AICompanionState(MessagesState):
             LangChain message type (HumanMessage, AIMessage, etc.)
         workflow (str): The current workflow the AI Companion is in. Can be "conversation", "image", or "audio".
         audio_buffer (bytes): The audio buffer to be used for speech-to-text conversion.
+        image_ref (str): Media store reference (`media:<sha256>`) of the image generated this turn.
         current_activity (str): The current activity of Ava based on the schedule.
         memory_context (str): The context of the memories to be injected into the character card.
+        user_id (str): The user the conversation belongs to; long-term memories are scoped to it.
     """
 
     summary: str
     workflow: str
     audio_buffer: bytes
-    image_path: str
+    image_ref: str
     current_activity: str
     apply_activity: bool
     memory_context: str
+    user_id: str
@@ -1,8 +1,27 @@
+import asyncio
+import logging
+import re
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import List, Optional
+
+import numpy as np
+from langchain_core.messages import BaseMessage
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from pydantic import BaseModel, Field
 
-from ai_companion.core.prompts import CHARACTER_CARD_PROMPT, ROUTER_PROMPT
-from ai_companion.graph.utils.helpers import AsteriskRemovalParser, get_chat_model
+from ai_companion.core.metrics import LatencyStats
+from ai_companion.core.prompts import CHARACTER_CARD_PROMPT, ROUTER_EXAMPLES, ROUTER_PROMPT
+from ai_companion.graph.utils.helpers import AsteriskRemovalParser, get_chain_model
+from ai_companion.settings import settings
+
+logger = logging.getLogger(__name__)
+
+CHARACTER_RESPONSE_TAG = "character_response"
+
+# Router decisions and their latency, keyed by source ("rule", "centroid" or "llm")
+router_decisions = LatencyStats()
 
 
 class RouterResponse(BaseModel):
@@ -11,8 +30,9 @@ class RouterResponse(BaseModel):
     )
 
 
+@lru_cache
 def get_router_chain():
-    model = get_chat_model(temperature=0.3).with_structured_output(RouterResponse)
+    model = get_chain_model("router", temperature=0.3).with_structured_output(RouterResponse)
 
     prompt = ChatPromptTemplate.from_messages(
         [("system", ROUTER_PROMPT), MessagesPlaceholder(variable_name="messages")]
@@ -21,20 +41,200 @@ def get_router_chain():
     return prompt | model
 
 
-def get_character_response_chain(summary: str = ""):
-    model = get_chat_model()
+@dataclass
+class RouteDecision:
+    workflow: str
+    source: str  # "rule", "centroid" or "llm"
+
+
+class FastRouter:
+    """Routes clear-cut turns without calling the LLM router.
+
+    Only the user's last message is looked at. Explicit requests to Ava for
+    a picture or a voice message are caught by regex rules. With
+    `use_centroids`, everything else is embedded with the memory embedding
+    model and compared with the centroid of each workflow's example
+    messages; the nearest centroid wins if it is both similar enough and
+    ahead of the runner-up by a margin. Negations, short follow-ups ("yes
+    please") and anything else uncertain return None so the LLM router,
+    which sees the wider conversation, decides.
+    """
+
+    # A request addressed to Ava: an imperative at the start of a clause ("send me..."),
+    # or a question or wish aimed at her ("can you show...", "I want you to draw...")
+    _ASKED = (
+        r"(?:(?:^|[.!?,;:]\s*|\b(?:and|so|then|now)\s+)(?:(?:hey|hi|ok|okay|ava)\W+)*"
+        r"|\b(?:can|could|would|will)\s+you\s+"
+        r"|\bi(?:['’]d| would)?\s+(?:like|love|want)\s+you\s+to\s+)"
+        r"(?:please\s+|just\s+)?"
+    )
+    # The user asking to see or hear something ("can I see...", "let me hear...")
+    _ASKED_TO_PERCEIVE = (
+        r"(?:\b(?:can|could|may)\s+i\s+|\blet\s+me\s+"
+        r"|\bi(?:['’]d| would)?\s+(?:like|love|want)\s+to\s+|\bi\s+wanna\s+)"
+    )
+    _IMAGE_NOUN = r"\W+(?:picture|pic|photo|image|selfie|drawing|painting|snapshot)s?\b"
+
+    IMAGE_REQUEST = re.compile(
+        _ASKED + r"(?:send|show|share|draw|paint|generate|create|make|take|snap)\b(?:\W+\w+){0,4}?"
+        + _IMAGE_NOUN
+        + r"|" + _ASKED_TO_PERCEIVE + r"see\b(?:\W+\w+){0,4}?" + _IMAGE_NOUN,
+        re.IGNORECASE,
+    )
+    AUDIO_REQUEST = re.compile(
+        _ASKED + r"(?:send|record|leave)\b(?:\W+\w+){0,3}?\W+(?:voice|audio)\b"
+        r"|" + _ASKED + r"(?:reply|answer|respond|talk|speak)\b(?:\W+\w+){0,2}?"
+        r"\W+(?:with|in|using|by)\s+(?:an?\s+|your\s+)?(?:voice|audio)\b"
+        r"|" + _ASKED + r"(?:say|read)\b(?:\W+\w+){0,3}?\W+out\s+loud\b"
+        r"|" + _ASKED_TO_PERCEIVE + r"hear\s+(?:you|your\s+voice)\b",
+        re.IGNORECASE,
+    )
+    NEGATION = re.compile(
+        r"\b(?:don['’]?t|do not|never|no|stop|can['’]?t|cannot|can not|won['’]?t|will not)\b",
+        re.IGNORECASE,
+    )
+    FOLLOW_UP = re.compile(
+        r"^\W*(yes|yeah|yep|sure|ok|okay|please|go ahead|do it|send it|why not)\b",
+        re.IGNORECASE,
+    )
+
+    def __init__(self, min_similarity: float, min_margin: float, use_centroids: bool = True):
+        self.min_similarity = min_similarity
+        self.min_margin = min_margin
+        self.use_centroids = use_centroids
+        self._labels: List[str] = []
+        self._centroids: Optional[np.ndarray] = None
+        self._centroids_lock = asyncio.Lock()
+
+    def match_rules(self, text: str) -> Optional[str]:
+        """Classify an explicit picture or voice request, or return None."""
+        if self.NEGATION.search(text):
+            return None
+        image = bool(self.IMAGE_REQUEST.search(text))
+        audio = bool(self.AUDIO_REQUEST.search(text))
+        if image != audio:
+            return "image" if image else "audio"
+        return None
+
+    @staticmethod
+    async def _embed(texts: List[str]) -> np.ndarray:
+        from ai_companion.modules.memory.long_term.vector_store import (
+            get_vector_store,
+            is_vector_store_loaded,
+        )
+
+        # The first use loads the embedding model, which must not block the event loop
+        if is_vector_store_loaded():
+            embedder = get_vector_store().embedder
+        else:
+            embedder = (await asyncio.to_thread(get_vector_store)).embedder
+        vectors = np.stack(await asyncio.gather(*(embedder.encode(text) for text in texts)))
+        return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+    async def _get_centroids(self) -> np.ndarray:
+        if self._centroids is None:
+            async with self._centroids_lock:
+                if self._centroids is None:
+                    centroids = []
+                    for label, examples in ROUTER_EXAMPLES.items():
+                        centroid = (await self._embed(examples)).mean(axis=0)
+                        centroids.append(centroid / np.linalg.norm(centroid))
+                    self._labels = list(ROUTER_EXAMPLES)
+                    self._centroids = np.stack(centroids)
+        return self._centroids
+
+    async def classify(self, text: str) -> Optional[str]:
+        """Classify a message by its nearest workflow centroid, or return None if unsure."""
+        if self.FOLLOW_UP.search(text) or self.NEGATION.search(text):
+            return None
+
+        centroids = await self._get_centroids()
+        similarities = centroids @ (await self._embed([text]))[0]
+        best, runner_up = np.argsort(-similarities)[:2]
+        if (
+            similarities[best] >= self.min_similarity
+            and similarities[best] - similarities[runner_up] >= self.min_margin
+        ):
+            return self._labels[best]
+        return None
+
+    async def route(self, messages: List[BaseMessage]) -> Optional[RouteDecision]:
+        """Route the conversation from its last user message, or return None to defer to the LLM."""
+        if not messages or messages[-1].type != "human" or not isinstance(messages[-1].content, str):
+            return None
+
+        text = messages[-1].content
+        workflow = self.match_rules(text)
+        if workflow:
+            return RouteDecision(workflow=workflow, source="rule")
+
+        if not self.use_centroids:
+            return None
+        workflow = await self.classify(text)
+        if workflow:
+            return RouteDecision(workflow=workflow, source="centroid")
+        return None
+
+
+@lru_cache
+def get_fast_router() -> FastRouter:
+    return FastRouter(
+        min_similarity=settings.ROUTER_FAST_PATH_MIN_SIMILARITY,
+        min_margin=settings.ROUTER_FAST_PATH_MIN_MARGIN,
+        use_centroids=settings.ROUTER_FAST_PATH_CENTROIDS,
+    )
+
+
+async def route_conversation(messages: List[BaseMessage]) -> RouteDecision:
+    """Pick the workflow for the next response, trying the fast path before the LLM router.
+
+    Args:
+        messages: The most recent messages of the conversation
+
+    Returns:
+        RouteDecision with the workflow and which router decided it
+    """
+    start = time.perf_counter()
+    decision = None
+    if settings.ROUTER_FAST_PATH:
+        try:
+            decision = await get_fast_router().route(messages)
+        except Exception as e:
+            logger.warning(f"Fast-path router failed, falling back to the LLM: {str(e)}")
+
+    if decision is None:
+        response = await get_router_chain().ainvoke({"messages": messages})
+        decision = RouteDecision(workflow=response.response_type, source="llm")
+
+    router_decisions.record(decision.source, time.perf_counter() - start)
+    logger.debug(f"Routed to {decision.workflow} by {decision.source}")
+    return decision
+
+
+@lru_cache(maxsize=2)
+def _get_character_response_prompt(with_summary: bool) -> ChatPromptTemplate:
     system_message = CHARACTER_CARD_PROMPT
 
-    if summary:
+    if with_summary:
         system_message += (
-            f"\n\nSummary of conversation earlier between Ava and the user: {summary}"
+            "\n\nSummary of conversation earlier between Ava and the user: {summary}"
         )
 
-    prompt = ChatPromptTemplate.from_messages(
+    return ChatPromptTemplate.from_messages(
         [
             ("system", system_message),
             MessagesPlaceholder(variable_name="messages"),
         ]
     )
 
-    return prompt | model | AsteriskRemovalParser()
+
+def get_character_response_chain(summary: str = ""):
+    prompt = _get_character_response_prompt(bool(summary))
+    if summary:
+        prompt = prompt.partial(summary=summary)
+
+    # The tag lets streaming consumers pick the reply tokens out of the
+    # other LLM calls made inside the same graph node
+    return (prompt | get_chain_model("character_response") | AsteriskRemovalParser()).with_config(
+        tags=[CHARACTER_RESPONSE_TAG]
+    )
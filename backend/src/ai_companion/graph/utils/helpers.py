@@ -1,35 +1,139 @@
+import asyncio
+import logging
 import re
+import time
+from dataclasses import dataclass
+from functools import lru_cache, wraps
+from typing import Tuple
 
+import httpx
 from langchain_core.output_parsers import StrOutputParser
-from langchain_groq import ChatGroq
 
-from ai_companion.modules.speech import TextToSpeech
+from ai_companion.modules.speech import SpeechToText, TextToSpeech
 from ai_companion.settings import settings
 from ai_companion.modules.image.text_to_image import TextToImage
 from ai_companion.modules.image.image_to_text import ImageToText
 from ai_companion.core.helpers import clean_env_var
+from ai_companion.core.metrics import LatencyStats
 
+logger = logging.getLogger(__name__)
 
-def get_chat_model(temperature: float = 0.7):
+# Per-node latency of the workflow graph, for this worker process
+node_latency = LatencyStats()
+
+
+@dataclass(frozen=True)
+class ModelTier:
+    """A Groq model together with the request budget of the chains bound to it."""
+
+    model_name: str
+    timeout: float  # Seconds per request, including the wait for a free slot
+    max_concurrency: int  # Requests in flight at once, per worker process
+
+
+def get_model_tier(tier: str) -> ModelTier:
+    """Get the model tier ("large" or "small") configured in settings."""
+    tiers = {
+        "large": ModelTier(
+            model_name=clean_env_var(settings.TEXT_MODEL_NAME),
+            timeout=settings.LARGE_MODEL_TIMEOUT,
+            max_concurrency=settings.LARGE_MODEL_MAX_CONCURRENCY,
+        ),
+        "small": ModelTier(
+            model_name=clean_env_var(settings.SMALL_TEXT_MODEL_NAME),
+            timeout=settings.SMALL_MODEL_TIMEOUT,
+            max_concurrency=settings.SMALL_MODEL_MAX_CONCURRENCY,
+        ),
+    }
+    return tiers[tier]
+
+
+@lru_cache
+def _get_tier_http_clients(tier: str) -> Tuple[httpx.Client, httpx.AsyncClient]:
+    # One connection pool per tier, shared by all of its chat models. The pool
+    # size is the concurrency limit: requests beyond it wait for a free connection.
+    model_tier = get_model_tier(tier)
+    limits = httpx.Limits(
+        max_connections=model_tier.max_concurrency,
+        max_keepalive_connections=model_tier.max_concurrency,
+    )
+    return (
+        httpx.Client(limits=limits, timeout=model_tier.timeout, follow_redirects=True),
+        httpx.AsyncClient(limits=limits, timeout=model_tier.timeout, follow_redirects=True),
+    )
+
+
+@lru_cache
+def get_chat_model(temperature: float = 0.7, tier: str = "large"):
+    from langchain_groq import ChatGroq
+
+    model_tier = get_model_tier(tier)
+    http_client, http_async_client = _get_tier_http_clients(tier)
     return ChatGroq(
         api_key=clean_env_var(settings.GROQ_API_KEY),
-        model_name=settings.TEXT_MODEL_NAME,
+        model_name=model_tier.model_name,
         temperature=temperature,
+        request_timeout=model_tier.timeout,
+        max_retries=2,
+        http_client=http_client,
+        http_async_client=http_async_client,
     )
 
 
+def get_chain_model(chain: str, temperature: float = 0.7):
+    """Get the chat model for a chain, on the tier CHAIN_MODEL_TIERS binds it to."""
+    return get_chat_model(temperature, settings.CHAIN_MODEL_TIERS.get(chain, "large"))
+
+
+@lru_cache
+def get_speech_to_text_module():
+    return SpeechToText()
+
+
+@lru_cache
 def get_text_to_speech_module():
     return TextToSpeech()
 
 
+@lru_cache
 def get_text_to_image_module():
     return TextToImage()
 
 
+@lru_cache
 def get_image_to_text_module():
     return ImageToText()
 
 
+def timed_node(func):
+    """Record the latency of a graph node under its function name."""
+    if asyncio.iscoroutinefunction(func):
+
+        @wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                node_latency.record(func.__name__, elapsed)
+                logger.debug(f"{func.__name__} took {elapsed * 1000:.1f} ms")
+
+        return async_wrapper
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            node_latency.record(func.__name__, elapsed)
+            logger.debug(f"{func.__name__} took {elapsed * 1000:.1f} ms")
+
+    return wrapper
+
+
 def remove_asterisk_content(text: str) -> str:
     """Remove content between asterisks from the text."""
     return re.sub(r"\*.*?\*", "", text).strip()
@@ -38,3 +142,30 @@ def remove_asterisk_content(text: str) -> str:
 class AsteriskRemovalParser(StrOutputParser):
     def parse(self, text):
         return remove_asterisk_content(super().parse(text))
+
+
+class AsteriskStreamFilter:
+    """Incremental counterpart of `remove_asterisk_content` for streamed tokens.
+
+    Text between a pair of asterisks may arrive split across several chunks,
+    so the filter keeps track of whether it is currently inside one.
+    """
+
+    def __init__(self):
+        self._inside = False
+        self._started = False
+
+    def feed(self, chunk: str) -> str:
+        """Return the visible part of a streamed chunk."""
+        visible = []
+        for char in chunk:
+            if char == "*":
+                self._inside = not self._inside
+            elif not self._inside:
+                visible.append(char)
+
+        text = "".join(visible)
+        if not self._started:
+            text = text.lstrip()
+            self._started = bool(text)
+        return text
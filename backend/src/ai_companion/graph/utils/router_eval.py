@@ -0,0 +1,142 @@
+"""Offline evaluation of the fast-path router against the LLM router.
+
+Conversations are read from a JSONL file, one conversation per line, e.g.:
+
+    {"messages": [{"role": "user", "content": "Send me a selfie"}], "label": "image"}
+
+`label` is optional. Each conversation is routed by both the fast path and
+the LLM router; the LLM's answer is the reference, and the label (when
+present) scores both routers against ground truth. With `with_llm=False`
+only the fast path runs, which needs no API key, and its decisions are
+scored against the labels alone. A labeled set ships in
+tests/fixtures/router_eval.jsonl.
+
+    import asyncio
+    from ai_companion.graph.utils.router_eval import evaluate_router, load_conversations
+
+    print(asyncio.run(evaluate_router(load_conversations("router_eval.jsonl"))).summary())
+"""
+
+import asyncio
+import json
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from langchain_core.messages import BaseMessage, convert_to_messages
+
+from ai_companion.graph.utils.chains import FastRouter, get_fast_router, get_router_chain
+from ai_companion.settings import settings
+
+
+@dataclass
+class RouterSample:
+    messages: List[BaseMessage]
+    label: Optional[str] = None
+
+
+@dataclass
+class RouterEvaluation:
+    """Per-sample router outcomes and the aggregate scores derived from them."""
+
+    with_llm: bool = True
+    total: int = 0
+    fast_path: int = 0  # Samples the fast path answered without the LLM
+    fast_path_agreement: int = 0  # ...of which the LLM router would have answered the same
+    by_source: Counter = field(default_factory=Counter)
+    confusion: Counter = field(default_factory=Counter)  # (fast path, LLM) for disagreements
+    labeled: int = 0
+    fast_path_labeled: int = 0  # Labeled samples the fast path answered
+    fast_path_correct: int = 0
+    llm_correct: int = 0
+    pipeline_correct: int = 0  # Fast path with LLM fallback, as deployed
+
+    def summary(self) -> Dict:
+        return {
+            "total": self.total,
+            "fast_path_coverage": round(self.fast_path / self.total, 4) if self.total else 0.0,
+            "fast_path_agreement_with_llm": (
+                round(self.fast_path_agreement / self.fast_path, 4)
+                if self.fast_path and self.with_llm
+                else None
+            ),
+            "fast_path_accuracy": (
+                round(self.fast_path_correct / self.fast_path_labeled, 4)
+                if self.fast_path_labeled
+                else None
+            ),
+            "by_source": dict(self.by_source),
+            "disagreements": {f"{fast}->{llm}": n for (fast, llm), n in self.confusion.items()},
+            "llm_accuracy": round(self.llm_correct / self.labeled, 4) if self.labeled else None,
+            "pipeline_accuracy": (
+                round(self.pipeline_correct / self.labeled, 4) if self.labeled else None
+            ),
+        }
+
+
+def load_conversations(path: str) -> List[RouterSample]:
+    """Read router evaluation samples from a JSONL file."""
+    samples = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                samples.append(
+                    RouterSample(convert_to_messages(record["messages"]), record.get("label"))
+                )
+    return samples
+
+
+async def evaluate_router(
+    samples: List[RouterSample],
+    concurrency: int = 4,
+    fast_router: Optional[FastRouter] = None,
+    with_llm: bool = True,
+) -> RouterEvaluation:
+    """Route every sample with the fast path and the LLM router and compare the answers.
+
+    Args:
+        samples: Conversations to route, optionally labeled with the expected workflow
+        concurrency: Maximum number of LLM router calls in flight
+        fast_router: The fast path to evaluate, by default the one configured in settings
+        with_llm: Whether to also call the LLM router; without it only the fast path is scored
+
+    Returns:
+        RouterEvaluation with coverage, agreement and (for labeled samples) accuracy
+    """
+    fast_router = fast_router or get_fast_router()
+    llm_router = get_router_chain() if with_llm else None
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def route(sample: RouterSample) -> Tuple[Optional[str], str, Optional[str]]:
+        messages = sample.messages[-settings.ROUTER_MESSAGES_TO_ANALYZE :]
+        fast = await fast_router.route(messages)
+        llm = None
+        if llm_router is not None:
+            async with semaphore:
+                llm = (await llm_router.ainvoke({"messages": messages})).response_type
+        return (fast.workflow if fast else None), (fast.source if fast else "llm"), llm
+
+    evaluation = RouterEvaluation(with_llm=with_llm)
+    for sample, (fast, source, llm) in zip(
+        samples, await asyncio.gather(*(route(sample) for sample in samples))
+    ):
+        evaluation.total += 1
+        evaluation.by_source[source] += 1
+        if fast is not None:
+            evaluation.fast_path += 1
+            if fast == llm:
+                evaluation.fast_path_agreement += 1
+            elif llm is not None:
+                evaluation.confusion[(fast, llm)] += 1
+
+        if sample.label is not None:
+            if fast is not None:
+                evaluation.fast_path_labeled += 1
+                evaluation.fast_path_correct += fast == sample.label
+            if llm is not None:
+                evaluation.labeled += 1
+                evaluation.llm_correct += llm == sample.label
+                evaluation.pipeline_correct += (fast or llm) == sample.label
+
+    return evaluation
@@ -1,22 +1,66 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+import aiosqlite
 from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
 from fastapi.security import HTTPBearer
+from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
 from ai_companion.interfaces.api.routes import chat_router, include_limiter
+from ai_companion.interfaces.api.runtime import GraphRuntime
+from ai_companion.interfaces.api.warmup import warm_up
 from fastapi.middleware.cors import CORSMiddleware
 from ai_companion.core.auth import verify_token
+from ai_companion.database.supabase import db
+from ai_companion.graph import graph_builder
+from ai_companion.modules.media.retention import run_media_garbage_collection
+from ai_companion.modules.memory.long_term.extraction_queue import get_memory_extraction_queue
+from ai_companion.modules.memory.short_term.summarizer import get_conversation_summarizer
+from ai_companion.settings import settings
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Compile the workflow graph once against a long-lived checkpointer."""
+    async with aiosqlite.connect(settings.SHORT_TERM_MEMORY_DB_PATH) as conn:
+        # WAL lets checkpoint reads proceed while another run is writing
+        await conn.execute("PRAGMA journal_mode=WAL")
+        short_term_memory = AsyncSqliteSaver(conn)
+        await short_term_memory.setup()
+
+        # Load the embedding model, memory collection and SDK clients in the background,
+        # so the server accepts requests (and passes its startup probe) without waiting
+        warmup_task = asyncio.create_task(warm_up()) if settings.WARMUP_ON_STARTUP else None
+        media_gc_task = (
+            asyncio.create_task(run_media_garbage_collection())
+            if settings.MEDIA_GC_INTERVAL_HOURS > 0
+            else None
+        )
+
+        runtime = GraphRuntime(graph_builder.compile(checkpointer=short_term_memory))
+        app.state.graph_runtime = runtime
+        print("Workflow graph compiled with persistent short-term memory")
+
+        yield
+
+        # Let in-flight runs finish before the checkpointer connection closes
+        await runtime.drain(timeout=settings.GRAPH_DRAIN_TIMEOUT)
+        for task in (warmup_task, media_gc_task):
+            if task is not None:
+                task.cancel()
+        # Summaries are written through the checkpointer, so they finish before it closes
+        await get_conversation_summarizer().stop(timeout=settings.GRAPH_DRAIN_TIMEOUT)
+        await get_memory_extraction_queue().stop(timeout=settings.GRAPH_DRAIN_TIMEOUT)
+        await db.close()
 
-import argparse
-from typing import Generator, Tuple
-import fastapi
-import numpy as np
-import os
 
 app = FastAPI(
     title="AI Companion API",
     description="API for AI Companion application",
     version="1.0.0",
     openapi_url="/openapi.json",
-    docs_url="/docs"
+    docs_url="/docs",
+    lifespan=lifespan,
 )
 security = HTTPBearer()
 
@@ -24,7 +68,8 @@ security = HTTPBearer()
 async def auth_middleware(request: Request, call_next):
     # Skip auth for specific endpoints
     # Allow unauthenticated access to health and docs (and their subpaths/static assets)
-    public_prefixes = ("/api/health", "/docs", "/redoc", "/openapi.json", "/static", "/favicon.ico")
+    # Media URLs carry an expiring signature instead, so they can be loaded by <img>/<audio> tags
+    public_prefixes = ("/api/health", "/api/media/", "/docs", "/redoc", "/openapi.json", "/static", "/favicon.ico")
     if any(request.url.path.startswith(p) for p in public_prefixes):
         return await call_next(request)
 
@@ -67,6 +112,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Has-More"],
 )
 app.include_router(chat_router)
 include_limiter(app)
@@ -1,25 +1,46 @@
-import logging
+import asyncio
 import base64
+import logging
+import json
+import time
 from io import BytesIO
-from typing import Dict, Optional, List
+from typing import Awaitable, Dict, Optional, List
 from jose import JWTError, jwt
 
-from fastapi import APIRouter, Response, UploadFile, File, Form, HTTPException, Body, Query, Path, Request
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Depends, Response, UploadFile, File, Form, HTTPException, Body, Query, Path, Request
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.openapi.utils import get_openapi
 from fastapi.openapi.docs import get_swagger_ui_html
 from langchain_core.messages import HumanMessage
-from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
 from ai_companion.core.auth import verify_token
 
-from ai_companion.graph import graph_builder
-from ai_companion.modules.image import ImageToText
-from ai_companion.modules.speech import SpeechToText, TextToSpeech
+from ai_companion.graph.utils.chains import CHARACTER_RESPONSE_TAG, router_decisions
+from ai_companion.graph.utils.helpers import (
+    AsteriskStreamFilter,
+    get_image_to_text_module,
+    get_speech_to_text_module,
+    get_text_to_speech_module,
+    node_latency,
+)
+from ai_companion.interfaces.api.runtime import GraphRuntime, get_graph_runtime
+from ai_companion.interfaces.api.warmup import warm_up
+from ai_companion.modules.memory.long_term.extraction_queue import get_memory_extraction_queue
+from ai_companion.modules.memory.long_term.vector_store import get_vector_store, is_vector_store_loaded
+from ai_companion.modules.memory.short_term.summarizer import get_conversation_summarizer
+from ai_companion.modules.media import (
+    get_media_store,
+    is_valid_digest,
+    media_url,
+    sniff_content_type,
+    verify_media_url,
+)
+from ai_companion.modules.speech import SpeechStream
+from ai_companion.modules.speech.tts_cache import get_tts_cache
 from ai_companion.settings import settings
 #from ai_companion.database.mongodb import db
 from ai_companion.database.supabase import db
 from ai_companion.models.message import Message, MessageContent
-from ai_companion.models.chat_session import ChatSession
+from ai_companion.models.chat_session import ChatSession, DEFAULT_CHAT_SESSION_TITLE
 
 from slowapi import Limiter
 from slowapi.util import get_remote_address
@@ -28,6 +49,9 @@ from slowapi.middleware import SlowAPIMiddleware
 
 logger = logging.getLogger(__name__)
 
+UPLOAD_CHUNK_SIZE = 64 * 1024
+DISCONNECT_POLL_INTERVAL = 0.5  # Seconds
+
 # Initialize rate limiter
 limiter = Limiter(key_func=get_remote_address)
 
@@ -66,11 +90,6 @@ def get_user_identifier(request: Request):
         return verify_token(token)
     return get_remote_address(request)
 
-# Global module instances
-speech_to_text = SpeechToText()
-text_to_speech = TextToSpeech()
-image_to_text = ImageToText()
-
 # Router for chat API
 chat_router = APIRouter()
 
@@ -104,7 +123,7 @@ async def create_chat_session(request: Request):
     """Create a new chat session"""
     try:
         user_id = request.state.user_id
-        session = ChatSession(title="New Chat Session", user_id=user_id)
+        session = ChatSession(title=DEFAULT_CHAT_SESSION_TITLE, user_id=user_id)
         stored_session = await db.create_chat_session(session)
         return stored_session
     except Exception as e:
@@ -195,6 +214,153 @@ async def delete_chat_session(
         logger.error(f"Error deleting chat session: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
+async def _process_user_input(
+    session_id: str,
+    message: Optional[str],
+    audio: Optional[UploadFile],
+    image: Optional[UploadFile],
+) -> Message:
+    """Turn the submitted text, audio or image into the user's chat message"""
+    # Initialize variables for content and buffers
+    content = ""
+    audio_buffer = None
+    image_bytes = None
+
+    # Process different input types
+    if audio:
+        # The form parser has already received the whole upload; reading it in chunks lets
+        # long recordings be cut into segments that are transcribed in parallel
+        chunks = []
+
+        async def read_upload():
+            while chunk := await audio.read(UPLOAD_CHUNK_SIZE):
+                chunks.append(chunk)
+                yield chunk
+
+        content = await get_speech_to_text_module().transcribe_stream(
+            read_upload(), audio.filename or "audio.wav"
+        )
+        audio_buffer = b"".join(chunks)
+    elif image:
+        image_bytes = await image.read()
+        content = await get_image_to_text_module().analyze_image(
+            image_bytes,
+            "Please describe what you see in this image in the context of our conversation."
+        )
+    elif message:
+        content = message
+    else:
+        raise HTTPException(status_code=400, detail="No valid input provided")
+
+    # Blobs go to the media store, the message only keeps a reference
+    media_store = get_media_store()
+    return Message(
+        session_id=session_id,
+        sender="user",
+        content=MessageContent(
+            type="conversation" if message else "audio" if audio else "image",
+            text=content,
+        ),
+        audio=await media_store.put(audio_buffer) if audio_buffer else None,
+        image=await media_store.put(image_bytes) if image_bytes else None
+    )
+
+
+async def _build_assistant_message(session_id: str, output_state: Dict) -> Message:
+    """Create the assistant message from the final graph state"""
+    workflow = output_state.get("workflow", "conversation")
+    response_message = output_state["messages"][-1].content
+
+    audio_buffer = output_state.get("audio_buffer") if workflow == "audio" else None
+    if isinstance(audio_buffer, BytesIO):
+        audio_buffer = audio_buffer.getvalue()
+    if workflow == "audio" and not isinstance(audio_buffer, bytes):
+        raise ValueError("Unsupported audio buffer format")
+    if workflow == "audio" and not audio_buffer:
+        # Nothing was spoken, e.g. speech synthesis failed; store the reply as text only
+        workflow = "conversation"
+
+    assistant_message = Message(
+        session_id=session_id,
+        sender="assistant",
+        content=MessageContent(
+            type=workflow,
+            text=response_message
+        )
+    )
+
+    # Handle different response types
+    media_store = get_media_store()
+    if workflow == "audio":
+        assistant_message.audio = await media_store.put(audio_buffer)
+
+    elif workflow == "image":
+        # The image node already stored the generated image
+        assistant_message.image = output_state["image_ref"]
+
+    return assistant_message
+
+
+async def _save_assistant_message(
+    session_id: str, output_state: Dict, runtime: GraphRuntime
+) -> Message:
+    """Store the assistant message of a finished run and schedule summarization"""
+    try:
+        stored_message = await db.save_message(
+            await _build_assistant_message(session_id, output_state)
+        )
+    except Exception as e:
+        logger.error(f"Error saving assistant message: {e}", exc_info=True)
+        raise
+    get_conversation_summarizer().schedule(runtime, session_id)
+    return stored_message
+
+
+def _message_response(message: Message) -> Dict:
+    """Shape a stored assistant message the way the frontend expects it"""
+    return {
+        "_id": str(message.id),
+        "timestamp": message.timestamp,
+        "sender": message.sender,
+        "session_id": message.session_id,
+        "content": message.content.model_dump(),
+        "audio": media_url(message.audio),
+        "image": media_url(message.image)
+    }
+
+
+async def _cancel_on_disconnect(request: Request, awaitable: Awaitable):
+    """Await a graph run, cancelling it (and the model calls it is waiting on) if the client goes away.
+
+    Streaming responses are cancelled by Starlette on disconnect; plain
+    responses are not, so a slow image or audio reply would otherwise keep
+    running for nobody.
+    """
+    task = asyncio.ensure_future(awaitable)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=DISCONNECT_POLL_INTERVAL)
+            if done:
+                return task.result()
+            if await request.is_disconnected():
+                logger.info("Client disconnected, cancelling graph run")
+                raise HTTPException(status_code=499, detail="Client closed request")
+    finally:
+        if not task.done():
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+
+def _sse_event(event: str, data: Dict) -> str:
+    """Format a single Server-Sent Event"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def _sse_audio_event(chunk: bytes) -> str:
+    """Format a piece of the spoken reply, base64-encoded MP3"""
+    return _sse_event("audio", {"data": base64.b64encode(chunk).decode("ascii")})
+
+
 @chat_router.post("/api/chat",
     response_model=Dict,
     summary="Send a message to chat",
@@ -209,6 +375,7 @@ async def chat_handler(
     message: Optional[str] = Form(None, description="Text message to send"),
     audio: Optional[UploadFile] = File(None, description="Audio file to process"),
     image: Optional[UploadFile] = File(None, description="Image file to analyze"),
+    runtime: GraphRuntime = Depends(get_graph_runtime),
 ):
     """Handle chat interactions from Next.js frontend"""
     try:
@@ -221,113 +388,183 @@ async def chat_handler(
             
         if session.user_id != user_id:
             raise HTTPException(status_code=403, detail="Not authorized to use this chat session")
-        
-        # Initialize variables for content and buffers
-        content = ""
-        audio_buffer = None
-        image_bytes = None
-
-        # Process different input types
-        if audio:
-            audio_data = await audio.read()
-            content = await speech_to_text.transcribe(audio_data)
-            audio_buffer = audio_data
-        elif image:
-            image_bytes = await image.read()
-            content = await image_to_text.analyze_image(
-                image_bytes,
-                "Please describe what you see in this image in the context of our conversation."
-            )
-        elif message:
-            content = message
-        else:
-            raise HTTPException(status_code=400, detail="No valid input provided")        # Create and store user message
-        user_message = Message(
-            session_id=session_id,
-            sender="user",
-            content=MessageContent(
-                type="conversation" if message else "audio" if audio else "image",
-                text=content,
-            ),
-            audio=base64.b64encode(audio_buffer).decode('utf-8') if audio_buffer else None,
-            image=base64.b64encode(image_bytes).decode('utf-8') if image_bytes else None
-        )
+
+        # Create and store user message
+        user_message = await _process_user_input(session_id, message, audio, image)
         stored_user_message = await db.save_message(user_message)
 
         # Process message through the graph agent
-        async with AsyncSqliteSaver.from_conn_string(
-            settings.SHORT_TERM_MEMORY_DB_PATH
-        ) as short_term_memory:
-            graph = graph_builder.compile(checkpointer=short_term_memory)
-            await graph.ainvoke(
-                {"messages": [HumanMessage(content=content)]},
-                {"configurable": {"thread_id": session_id}},
+        config = {"configurable": {"thread_id": session_id}}
+        async with runtime.run(session_id) as graph:
+            await _cancel_on_disconnect(
+                request,
+                graph.ainvoke(
+                    {
+                        "messages": [HumanMessage(content=user_message.content.text)],
+                        "user_id": user_id,
+                    },
+                    config,
+                ),
             )
 
-            output_state = await graph.aget_state(
-                config={"configurable": {"thread_id": session_id}}
-            )
+            output_state = await graph.aget_state(config=config)
 
-        workflow = output_state.values.get("workflow", "conversation")
-        response_message = output_state.values["messages"][-1].content
+        # Create and store assistant's response
+        assistant_message = await _build_assistant_message(session_id, output_state.values)
+        stored_assistant_message = await db.save_message(assistant_message)
 
-        # Create and store assistant message
-        assistant_message = Message(
-            session_id=session_id,
-            sender="assistant",
-            content=MessageContent(
-                type=workflow,
-                text=response_message
-            )
-        )
+        # Keep the thread's short-term memory within budget without delaying this reply
+        get_conversation_summarizer().schedule(runtime, session_id)
 
-        # Handle different response types
-        if workflow == "audio":
-            audio_buffer = output_state.values["audio_buffer"]
-            if isinstance(audio_buffer, bytes):
-                assistant_message.audio = base64.b64encode(audio_buffer).decode('utf-8')
-            elif isinstance(audio_buffer, BytesIO):
-                assistant_message.audio = base64.b64encode(audio_buffer.getvalue()).decode('utf-8')
-            else:
-                raise ValueError("Unsupported audio buffer format")
-                
-        elif workflow == "image":
-            image_path = output_state.values["image_path"]
-            with open(image_path, "rb") as f:
-                assistant_message.image = base64.b64encode(f.read()).decode('utf-8')
-
-        # Store assistant's response
-        stored_assistant_message = await db.save_message(assistant_message)
+        return _message_response(stored_assistant_message)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error processing message: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
 
-        # Prepare response data
-        response_data = {
-            "_id": str(stored_assistant_message.id),
-            "timestamp": stored_assistant_message.timestamp,
-            "sender": stored_assistant_message.sender,
-            "session_id": session_id,
-            "content": stored_assistant_message.content.model_dump(),
-            "audio": stored_assistant_message.audio,
-            "image": stored_assistant_message.image
-        }
 
-        return response_data
+@chat_router.post("/api/chat/stream",
+    summary="Send a message to chat and stream the reply",
+    description="""Same inputs as `/api/chat`, but the reply is streamed as Server-Sent Events.
+    `token` events carry reply text as it is generated, followed by a single `message` event
+    with the stored assistant message (same shape as `/api/chat`), or an `error` event.
+    When the reply is spoken, `audio` events carry the speech as base64 MP3 chunks, sentence by
+    sentence while the text is still being generated; appended in order they form one MP3 stream,
+    which is also stored as the message's audio. If speaking fails, an `audio_error` event is sent
+    instead of the rest of the audio and the reply is stored as text only.""",
+    response_description="A text/event-stream of the assistant's reply",
+    tags=["Chat"])
+@message_send_limit
+async def chat_stream_handler(
+    request: Request,
+    session_id: str = Form(..., description="ID of the chat session"),
+    message: Optional[str] = Form(None, description="Text message to send"),
+    audio: Optional[UploadFile] = File(None, description="Audio file to process"),
+    image: Optional[UploadFile] = File(None, description="Image file to analyze"),
+    runtime: GraphRuntime = Depends(get_graph_runtime),
+):
+    """Stream the assistant's reply token by token"""
+    try:
+        user_id = request.state.user_id
+
+        # Verify session ownership
+        session = await db.get_chat_session(session_id)
+        if not session:
+            raise HTTPException(status_code=404, detail="Chat session not found")
+
+        if session.user_id != user_id:
+            raise HTTPException(status_code=403, detail="Not authorized to use this chat session")
 
+        user_message = await _process_user_input(session_id, message, audio, image)
+        await db.save_message(user_message)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error processing message: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
+    async def event_stream():
+        # Audio replies are spoken here sentence by sentence instead of by the audio node
+        config = {"configurable": {"thread_id": session_id, "stream_audio": True}}
+        token_filter = AsteriskStreamFilter()
+        speech = None
+        speech_error = None  # Set once speaking the reply has failed; the text carries on
+        output_values = None  # Set once the run has finished and its reply is checkpointed
+        saving = None
+        try:
+            async with runtime.run(session_id) as graph:
+                async for event in graph.astream_events(
+                    {
+                        "messages": [HumanMessage(content=user_message.content.text)],
+                        "user_id": user_id,
+                    },
+                    config,
+                    version="v2",
+                ):
+                    if (
+                        event["event"] == "on_chat_model_stream"
+                        and CHARACTER_RESPONSE_TAG in event.get("tags", [])
+                    ):
+                        text = token_filter.feed(event["data"]["chunk"].content)
+                        if text:
+                            yield _sse_event("token", {"text": text})
+                            if event["metadata"].get("langgraph_node") == "audio_node":
+                                if speech is None:
+                                    speech = SpeechStream(get_text_to_speech_module())
+                                speech.feed(text)
+
+                    if speech is not None and speech_error is None:
+                        try:
+                            for chunk in speech.ready():
+                                yield _sse_audio_event(chunk)
+                        except Exception as e:
+                            speech_error = e
+
+                output_state = await graph.aget_state(config=config)
+
+            output_values = output_state.values
+            if speech is not None:
+                speech.close()
+                if speech_error is None:
+                    try:
+                        async for chunk in speech.remaining():
+                            yield _sse_audio_event(chunk)
+                    except Exception as e:
+                        speech_error = e
+                output_values = {
+                    **output_values,
+                    "audio_buffer": speech.audio if speech_error is None else b"",
+                }
+            if speech_error is not None:
+                logger.error(f"Error speaking streamed reply: {speech_error}", exc_info=speech_error)
+                yield _sse_event("audio_error", {"detail": str(speech_error)})
+
+            # Persist only once the whole reply has been generated. The save runs in a task of
+            # its own, so a disconnect while it is in progress doesn't cancel it
+            saving = runtime.spawn(_save_assistant_message(session_id, output_values, runtime))
+            stored_assistant_message = await asyncio.shield(saving)
+            yield _sse_event("message", _message_response(stored_assistant_message))
+
+        except Exception as e:
+            logger.error(f"Error streaming message: {e}", exc_info=True)
+            yield _sse_event("error", {"detail": str(e)})
+        finally:
+            # Also reached when the client disconnects mid-stream
+            if speech is not None:
+                speech.cancel()
+            if output_values is not None and saving is None:
+                # The client went away after the reply was checkpointed, e.g. while its audio
+                # was streaming; store it anyway so the history matches Ava's context
+                runtime.spawn(_save_assistant_message(session_id, output_values, runtime))
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 
 @chat_router.get("/api/messages/{session_id}",
     response_model=List[Dict],
     summary="Get session messages",
-    description="Retrieves all messages for a specific chat session",
+    description="""Retrieves one page of messages for a chat session, in chronological order.
+    Without a cursor the latest page is returned. Pass a message's `cursor` as `before` to load
+    older messages, or as `after` to load newer ones. The `X-Has-More` response header tells
+    whether another page exists in that direction.""",
     response_description="List of messages with their content and metadata",
     tags=["Messages"])
 async def get_session_messages(
     request: Request,
-    session_id: str = Path(..., description="The ID of the chat session to get messages from")
+    response: Response,
+    session_id: str = Path(..., description="The ID of the chat session to get messages from"),
+    before: Optional[str] = Query(None, description="Return messages older than this cursor"),
+    after: Optional[str] = Query(None, description="Return messages newer than this cursor"),
+    limit: int = Query(50, ge=1, le=100, description="Maximum number of messages to return"),
+    include_media: bool = Query(True, description="Include the audio and image of each message"),
 ):
-    """Retrieve all messages for a session"""
+    """Retrieve a page of messages for a session"""
     try:
         user_id = request.state.user_id
         
@@ -339,20 +576,148 @@ async def get_session_messages(
         if session.user_id != user_id:
             raise HTTPException(status_code=403, detail="Not authorized to access this chat session")
         
-        messages = await db.get_messages(session_id)
+        if before and after:
+            raise HTTPException(status_code=400, detail="Only one of before or after can be provided")
+
+        for cursor in (before, after):
+            if cursor:
+                try:
+                    Message.decode_cursor(cursor)
+                except ValueError as e:
+                    raise HTTPException(status_code=400, detail=str(e))
+
+        page = await db.get_messages_page(
+            session_id, limit=limit, before=before, after=after, include_media=include_media
+        )
+        response.headers["X-Has-More"] = "true" if page.has_more else "false"
         return [
             {
                 **msg.model_dump(by_alias=True),
-                "audio": msg.audio if msg.audio else None,  # Ensure audio is included in response
-                "image": msg.image if msg.image else None,  # Ensure image is included in response
+                "cursor": msg.cursor,
+                "audio": media_url(msg.audio) if msg.audio else None,  # Ensure audio is included in response
+                "image": media_url(msg.image) if msg.image else None,  # Ensure image is included in response
             }
-            for msg in messages
+            for msg in page.messages
         ]
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error retrieving messages: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _parse_range(range_header: str, size: int) -> Optional[tuple[int, int]]:
+    """Parse a single `bytes=start-end` range into inclusive offsets"""
+    unit, _, spec = range_header.partition("=")
+    if unit.strip() != "bytes" or "," in spec:
+        return None
+
+    start_str, _, end_str = spec.strip().partition("-")
+    if not start_str:
+        # Suffix range: the last N bytes
+        length = int(end_str)
+        return (max(size - length, 0), size - 1) if length > 0 else None
+
+    start = int(start_str)
+    end = int(end_str) if end_str else size - 1
+    if start >= size or end < start:
+        return None
+    return start, min(end, size - 1)
+
+
+@chat_router.get("/api/media/{digest}",
+    summary="Download media",
+    description="""Serves an audio or image blob referenced by a message. Blobs are addressed
+    by the SHA-256 digest of their content and support HTTP range requests. Media URLs are
+    returned, signed and with an expiry, by the message endpoints; the signature stands in for
+    the `Authorization` header so `<img>` and `<audio>` tags can load them.""",
+    response_description="The media bytes",
+    tags=["Messages"])
+async def get_media(
+    request: Request,
+    digest: str = Path(..., description="SHA-256 digest of the media content"),
+    expires: int = Query(..., description="Expiry of the URL, as a Unix timestamp"),
+    signature: str = Query(..., description="Signature of the digest and expiry"),
+):
+    """Serve a content-addressed media blob"""
+    if not is_valid_digest(digest):
+        raise HTTPException(status_code=404, detail="Media not found")
+    if not verify_media_url(digest, expires, signature):
+        raise HTTPException(status_code=403, detail="Invalid or expired media URL")
+
+    etag = f'"{digest}"'
+    headers = {
+        "Accept-Ranges": "bytes",
+        "ETag": etag,
+        # Content never changes for a given digest; the URL stops working at its expiry
+        "Cache-Control": f"private, max-age={max(0, expires - int(time.time()))}, immutable",
+    }
+    if request.headers.get("If-None-Match") == etag:
+        return Response(status_code=304, headers=headers)
+
+    data = await get_media_store().get(digest)
+    if data is None:
+        raise HTTPException(status_code=404, detail="Media not found")
+
+    media_type = sniff_content_type(data)
+    range_header = request.headers.get("Range")
+    if range_header:
+        try:
+            byte_range = _parse_range(range_header, len(data))
+        except ValueError:
+            byte_range = None
+        if byte_range is None:
+            return Response(
+                status_code=416,
+                headers={**headers, "Content-Range": f"bytes */{len(data)}"},
+            )
+
+        start, end = byte_range
+        return Response(
+            content=data[start:end + 1],
+            status_code=206,
+            media_type=media_type,
+            headers={**headers, "Content-Range": f"bytes {start}-{end}/{len(data)}"},
+        )
+
+    return Response(content=data, media_type=media_type, headers=headers)
+
+
+@chat_router.get("/api/metrics",
+    response_model=Dict,
+    summary="Runtime metrics",
+    description="Counters for the background pipelines of this worker process",
+    response_description="Metrics grouped by subsystem",
+    tags=["System"])
+async def get_metrics(runtime: GraphRuntime = Depends(get_graph_runtime)):
+    """Metrics endpoint"""
+    return {
+        "graph": {"in_flight": runtime.in_flight, "node_latency": node_latency.snapshot()},
+        "router": router_decisions.snapshot(),
+        "memory_extraction": get_memory_extraction_queue().get_stats(),
+        "summarization": get_conversation_summarizer().get_stats(),
+        "tts_cache": get_tts_cache().get_stats() if get_tts_cache() else None,
+        # Reported once memory has been used, so polling metrics doesn't load the embedding model
+        "embedding_cache": (
+            get_vector_store().embedding_cache.get_stats() if is_vector_store_loaded() else None
+        ),
+    }
+
+
+@chat_router.get("/api/warmup",
+    response_model=Dict,
+    summary="Warm up",
+    description="""Loads the subsystems that are otherwise initialized on first use (embedding model,
+    memory collection, model and SDK clients, database connection), so the first chat request does
+    not pay for them. Safe to call repeatedly. Requires authentication.""",
+    response_description="Time spent on each subsystem, or \"error\" if it failed",
+    tags=["System"])
+@limiter.limit("5/minute", key_func=get_user_identifier)
+async def warmup(request: Request):
+    """Warm-up endpoint"""
+    return await warm_up()
+
+
 @chat_router.get("/api/health",
     response_model=Dict[str, str],
     summary="Health check",
@@ -0,0 +1,115 @@
+import asyncio
+import logging
+import weakref
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Optional, TypeVar
+
+from fastapi import HTTPException, Request
+from langgraph.graph.state import CompiledStateGraph
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class GraphRuntime:
+    """Process-wide compiled workflow graph with in-flight run tracking.
+
+    The graph is compiled once at application startup against a long-lived
+    checkpointer. Every request borrows it through `run()`, which lets the
+    shutdown hook stop accepting new runs and wait for the running ones.
+
+    Runs on the same thread are serialized through a per-thread lock, which
+    background writers to the thread's state (e.g. the conversation
+    summarizer) take too, so no run works from a checkpoint they replace.
+    """
+
+    def __init__(self, graph: CompiledStateGraph):
+        self.graph = graph
+        self._in_flight = 0
+        self._accepting = True
+        self._idle = asyncio.Event()
+        self._idle.set()
+        # Entries disappear once no run is holding or waiting for the lock
+        self._thread_locks: weakref.WeakValueDictionary[str, asyncio.Lock] = (
+            weakref.WeakValueDictionary()
+        )
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @asynccontextmanager
+    async def thread_lock(self, thread_id: str) -> AsyncIterator[None]:
+        """Hold exclusive access to one conversation thread's state."""
+        lock = self._thread_locks.get(thread_id)
+        if lock is None:
+            lock = self._thread_locks[thread_id] = asyncio.Lock()
+        async with lock:
+            yield
+
+    @asynccontextmanager
+    async def run(self, thread_id: Optional[str] = None) -> AsyncIterator[CompiledStateGraph]:
+        """Borrow the compiled graph for the duration of one run.
+
+        Args:
+            thread_id: Conversation thread the run reads and writes, if any
+        """
+        if not self._accepting:
+            raise HTTPException(status_code=503, detail="Server is shutting down")
+
+        self._in_flight += 1
+        self._idle.clear()
+        try:
+            if thread_id is None:
+                yield self.graph
+            else:
+                async with self.thread_lock(thread_id):
+                    yield self.graph
+        finally:
+            self._in_flight -= 1
+            if self._in_flight == 0:
+                self._idle.set()
+
+    def spawn(self, awaitable: Awaitable[T]) -> "asyncio.Task[T]":
+        """Finish the work of a completed run in a task of its own.
+
+        The task outlives the request that started it, so e.g. a reply is
+        still saved when the client disconnects, and `drain()` waits for it
+        like for a run. Failures are up to the awaitable to log.
+        """
+        self._in_flight += 1
+        self._idle.clear()
+        task = asyncio.ensure_future(awaitable)
+        task.add_done_callback(self._spawned_done)
+        return task
+
+    def _spawned_done(self, task: asyncio.Task) -> None:
+        if not task.cancelled():
+            task.exception()  # Retrieved, so an unawaited failure isn't reported again
+        self._in_flight -= 1
+        if self._in_flight == 0:
+            self._idle.set()
+
+    async def drain(self, timeout: Optional[float] = None) -> bool:
+        """Stop accepting new runs and wait for in-flight ones to finish.
+
+        Returns:
+            bool: True if all runs finished before the timeout
+        """
+        self._accepting = False
+        if self._in_flight:
+            logger.info(f"Draining {self._in_flight} in-flight graph run(s)")
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout=timeout)
+            return True
+        except asyncio.TimeoutError:
+            logger.warning(
+                f"Timed out draining graph runs, {self._in_flight} still in flight"
+            )
+            return False
+
+
+def get_graph_runtime(request: Request) -> GraphRuntime:
+    """Get the GraphRuntime created by the application lifespan."""
+    return request.app.state.graph_runtime
@@ -0,0 +1,58 @@
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Dict, Union
+
+from ai_companion.database.supabase import db
+from ai_companion.graph.utils.helpers import (
+    get_chat_model,
+    get_image_to_text_module,
+    get_speech_to_text_module,
+    get_text_to_image_module,
+    get_text_to_speech_module,
+)
+from ai_companion.modules.memory.long_term.memory_manager import get_memory_manager
+from ai_companion.modules.memory.long_term.vector_store import get_vector_store
+
+logger = logging.getLogger(__name__)
+
+
+async def _load_memory() -> None:
+    # Loading the embedding model is blocking, so it runs on a worker thread
+    vector_store = await asyncio.to_thread(get_vector_store)
+    await vector_store.aensure_collection()
+    await asyncio.to_thread(get_memory_manager)
+
+
+# Heavy SDK imports happen inside the client properties, so touching them loads the SDK
+_STEPS: Dict[str, Callable[[], Awaitable[object]]] = {
+    "database": db.connect,
+    "memory": _load_memory,
+    "chat_model": lambda: asyncio.to_thread(get_chat_model),
+    "speech_to_text": lambda: asyncio.to_thread(lambda: get_speech_to_text_module().client),
+    "text_to_speech": lambda: asyncio.to_thread(lambda: get_text_to_speech_module().client),
+    "image_to_text": lambda: asyncio.to_thread(lambda: get_image_to_text_module().client),
+    "text_to_image": lambda: asyncio.to_thread(lambda: get_text_to_image_module().together_client),
+}
+
+
+async def warm_up() -> Dict[str, Union[Dict, str]]:
+    """Initialize the lazily loaded subsystems ahead of the first request.
+
+    Every step is cached after its first success, so calling this again is
+    cheap. A failing step is reported and left to retry on first use.
+
+    Returns:
+        Dict: Milliseconds spent per subsystem, or "error" for a failed one (the
+        details are logged, not returned)
+    """
+    report = {}
+    for name, step in _STEPS.items():
+        start = time.perf_counter()
+        try:
+            await step()
+            report[name] = {"ms": round((time.perf_counter() - start) * 1000, 1)}
+        except Exception as e:
+            logger.warning(f"Warm-up of {name} failed: {str(e)}")
+            report[name] = "error"
+    return report
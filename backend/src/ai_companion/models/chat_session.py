@@ -3,6 +3,8 @@ from typing import Optional
 from pydantic import BaseModel, Field, ConfigDict
 import uuid
 
+DEFAULT_CHAT_SESSION_TITLE = "New Chat Session"
+
 class ChatSession(BaseModel):
     """Chat session model for Supabase storage."""
     model_config = ConfigDict(
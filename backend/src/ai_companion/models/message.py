@@ -1,6 +1,7 @@
 from datetime import datetime, timezone
-from typing import Optional, Literal
+from typing import List, Optional, Literal, Tuple
 from pydantic import BaseModel, Field, ConfigDict, field_validator
+import base64
 import uuid
 
 
@@ -28,4 +29,31 @@ class Message(BaseModel):
     timestamp: str = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
     audio: Optional[str] = None
     image: Optional[str] = None
-    pdf: Optional[str] = None
\ No newline at end of file
+    pdf: Optional[str] = None
+
+    @property
+    def cursor(self) -> str:
+        """Opaque keyset pagination cursor for this message (timestamp + id)."""
+        raw = f"{self.timestamp}|{self.id}".encode("utf-8")
+        return base64.urlsafe_b64encode(raw).decode("ascii")
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> Tuple[str, str]:
+        """Decode a cursor into its (timestamp, id) pair.
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        try:
+            timestamp, message_id = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8").split("|")
+            datetime.fromisoformat(timestamp)
+            uuid.UUID(message_id)
+        except Exception as e:
+            raise ValueError(f"Invalid message cursor: {cursor}") from e
+        return timestamp, message_id
+
+
+class MessagePage(BaseModel):
+    """A page of messages in chronological order."""
+    messages: List[Message]
+    has_more: bool
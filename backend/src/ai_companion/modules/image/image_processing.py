@@ -0,0 +1,67 @@
+import asyncio
+import io
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+from ai_companion.settings import settings
+
+# Quality steps tried, in order, until the encoded image fits IMAGE_MAX_BYTES
+_FALLBACK_QUALITIES = (70, 55, 40)
+
+_PIL_FORMATS = {"webp": "WEBP", "jpeg": "JPEG", "png": "PNG"}
+
+
+@lru_cache
+def _get_executor() -> ThreadPoolExecutor:
+    # A pool of its own, so image encoding never queues behind embedding or file I/O work
+    return ThreadPoolExecutor(
+        max_workers=settings.IMAGE_PROCESSING_WORKERS, thread_name_prefix="image-processing"
+    )
+
+
+def _encode(image, image_format: str, quality: int) -> bytes:
+    buffer = io.BytesIO()
+    if image_format == "png":
+        image.save(buffer, format="PNG", optimize=True)
+    else:
+        image.save(buffer, format=_PIL_FORMATS[image_format], quality=quality)
+    return buffer.getvalue()
+
+
+def prepare_image(data: bytes) -> bytes:
+    """Re-encode an image for storage and delivery, within the configured limits.
+
+    The image is scaled down to fit IMAGE_MAX_DIMENSION and encoded as
+    IMAGE_OUTPUT_FORMAT at IMAGE_QUALITY. If the result is still larger than
+    IMAGE_MAX_BYTES, lower qualities are tried, then the image is halved in
+    size until it fits. CPU-bound; use `process_image` from async code.
+
+    Args:
+        data: The encoded source image, in any format Pillow reads
+
+    Returns:
+        bytes: The re-encoded image
+    """
+    from PIL import Image
+
+    image_format = settings.IMAGE_OUTPUT_FORMAT
+    with Image.open(io.BytesIO(data)) as source:
+        image = source.convert("RGBA" if image_format != "jpeg" and source.has_transparency_data else "RGB")
+    image.thumbnail((settings.IMAGE_MAX_DIMENSION, settings.IMAGE_MAX_DIMENSION))
+
+    encoded = _encode(image, image_format, settings.IMAGE_QUALITY)
+    if image_format != "png":
+        for quality in (q for q in _FALLBACK_QUALITIES if q < settings.IMAGE_QUALITY):
+            if len(encoded) <= settings.IMAGE_MAX_BYTES:
+                break
+            encoded = _encode(image, image_format, quality)
+
+    while len(encoded) > settings.IMAGE_MAX_BYTES and min(image.size) > 64:
+        image = image.resize((image.width // 2, image.height // 2), Image.Resampling.LANCZOS)
+        encoded = _encode(image, image_format, min(settings.IMAGE_QUALITY, _FALLBACK_QUALITIES[-1]))
+    return encoded
+
+
+async def process_image(data: bytes) -> bytes:
+    """Async version of `prepare_image`, run on the image processing thread pool."""
+    return await asyncio.get_running_loop().run_in_executor(_get_executor(), prepare_image, data)
@@ -1,13 +1,15 @@
 import os
 import base64
-from typing import Optional, Union
+from typing import TYPE_CHECKING, Optional, Union
 import logging
-from groq import Groq
 
 from ai_companion.settings import settings
 from ai_companion.core.exceptions import ImageToTextError
 from ai_companion.core.helpers import clean_env_var
 
+if TYPE_CHECKING:
+    from groq import Groq
+
 
 class ImageToText:
     """A class to handle image-to-text conversion using Groq's vision capabilities."""
@@ -17,7 +19,7 @@ class ImageToText:
     def __init__(self):
         """Initialize the ImageToText class and validate environment variables."""
         self._validate_env_vars()
-        self._client: Optional[Groq] = None
+        self._client: Optional["Groq"] = None
         self.logger = logging.getLogger(__name__)
 
     def _validate_env_vars(self) -> None:
@@ -29,9 +31,11 @@ class ImageToText:
             )
 
     @property
-    def client(self) -> Groq:
+    def client(self) -> "Groq":
         """Get or create Groq client instance using singleton pattern."""
         if self._client is None:
+            from groq import Groq
+
             self._client = Groq(api_key=clean_env_var(settings.GROQ_API_KEY))
         return self._client
 
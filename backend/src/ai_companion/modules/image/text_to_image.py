@@ -1,18 +1,19 @@
+import asyncio
 import base64
 import logging
 import os
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
-from langchain.prompts import PromptTemplate
-from langchain_groq import ChatGroq
+from langchain_core.prompts import PromptTemplate
 from pydantic import BaseModel, Field
-from together import Together
 
 from ai_companion.core.exceptions import TextToImageError
 from ai_companion.core.prompts import IMAGE_ENHANCEMENT_PROMPT, IMAGE_SCENARIO_PROMPT
 from ai_companion.settings import settings
 from ai_companion.core.helpers import clean_env_var
 
+if TYPE_CHECKING:
+    from together import AsyncTogether
 
 
 class ScenarioPrompt(BaseModel):
@@ -36,14 +37,23 @@ class EnhancedPrompt(BaseModel):
 
 
 class TextToImage:
-    """A class to handle text-to-image generation using Together AI."""
+    """A class to handle text-to-image generation using Together AI.
+
+    Every call is non-blocking. Image requests to Together are capped at
+    `TTI_MAX_CONCURRENCY` per worker and bounded by `TTI_TIMEOUT` seconds,
+    including the wait for a free slot; the scenario and prompt chains run
+    on the Groq model tiers, which carry their own limits. Cancelling the
+    calling task (e.g. because the client disconnected) aborts the request
+    in flight.
+    """
 
     REQUIRED_ENV_VARS = ["GROQ_API_KEY", "TOGETHER_API_KEY"]
 
     def __init__(self):
         """Initialize the TextToImage class and validate environment variables."""
         self._validate_env_vars()
-        self._together_client: Optional[Together] = None
+        self._together_client: Optional["AsyncTogether"] = None
+        self._together_slots = asyncio.Semaphore(settings.TTI_MAX_CONCURRENCY)
         self.logger = logging.getLogger(__name__)
 
     def _validate_env_vars(self) -> None:
@@ -55,21 +65,20 @@ class TextToImage:
             )
 
     @property
-    def together_client(self) -> Together:
-        """Get or create Together client instance using singleton pattern."""
+    def together_client(self) -> "AsyncTogether":
+        """Get or create AsyncTogether client instance using singleton pattern."""
         if self._together_client is None:
-            self._together_client = Together(api_key=clean_env_var(settings.TOGETHER_API_KEY))
-        return self._together_client
-
-    async def generate_image(self, prompt: str, output_path: str = "") -> bytes:
-        """Generate an image from a prompt using Together AI."""
-        if not prompt.strip():
-            raise ValueError("Prompt cannot be empty")
+            from together import AsyncTogether
 
-        try:
-            self.logger.info(f"Generating image for prompt: '{prompt}'")
+            self._together_client = AsyncTogether(
+                api_key=clean_env_var(settings.TOGETHER_API_KEY),
+                timeout=settings.TTI_TIMEOUT,
+            )
+        return self._together_client
 
-            response = self.together_client.images.generate(
+    async def _request_image(self, prompt: str):
+        async with self._together_slots:
+            return await self.together_client.images.generate(
                 prompt=prompt,
                 model=settings.TTI_MODEL_NAME,
                 width=1024,
@@ -79,16 +88,28 @@ class TextToImage:
                 response_format="b64_json",
             )
 
-            image_data = base64.b64decode(response.data[0].b64_json)
+    async def generate_image(self, prompt: str) -> bytes:
+        """Generate an image from a prompt using Together AI.
+
+        Returns:
+            bytes: The generated PNG image
+        """
+        if not prompt.strip():
+            raise ValueError("Prompt cannot be empty")
+
+        try:
+            self.logger.info(f"Generating image for prompt: '{prompt}'")
 
-            if output_path:
-                os.makedirs(os.path.dirname(output_path), exist_ok=True)
-                with open(output_path, "wb") as f:
-                    f.write(image_data)
-                self.logger.info(f"Image saved to {output_path}")
+            response = await asyncio.wait_for(
+                self._request_image(prompt), timeout=settings.TTI_TIMEOUT
+            )
 
-            return image_data
+            return base64.b64decode(response.data[0].b64_json)
 
+        except asyncio.TimeoutError as e:
+            raise TextToImageError(
+                f"Image generation timed out after {settings.TTI_TIMEOUT} seconds"
+            ) from e
         except Exception as e:
             raise TextToImageError(f"Failed to generate image: {str(e)}") from e
 
@@ -101,12 +122,10 @@ class TextToImage:
 
             self.logger.info("Creating scenario from chat history")
 
-            llm = ChatGroq(
-                model=settings.TEXT_MODEL_NAME,
-                api_key=clean_env_var(settings.GROQ_API_KEY),
-                temperature=0.4,
-                max_retries=2,
-            )
+            # Imported here because graph.utils.helpers imports this module
+            from ai_companion.graph.utils.helpers import get_chain_model
+
+            llm = get_chain_model("scenario", temperature=0.4)
 
             structured_llm = llm.with_structured_output(ScenarioPrompt)
 
@@ -118,7 +137,7 @@ class TextToImage:
                 | structured_llm
             )
 
-            scenario = chain.invoke({"chat_history": formatted_history})
+            scenario = await chain.ainvoke({"chat_history": formatted_history})
             self.logger.info(f"Created scenario: {scenario}")
 
             return scenario
@@ -131,12 +150,10 @@ class TextToImage:
         try:
             self.logger.info(f"Enhancing prompt: '{prompt}'")
 
-            llm = ChatGroq(
-                model=settings.TEXT_MODEL_NAME,
-                api_key=clean_env_var(settings.GROQ_API_KEY),
-                temperature=0.25,
-                max_retries=2,
-            )
+            # Imported here because graph.utils.helpers imports this module
+            from ai_companion.graph.utils.helpers import get_chain_model
+
+            llm = get_chain_model("prompt_enhancer", temperature=0.25)
 
             structured_llm = llm.with_structured_output(EnhancedPrompt)
 
@@ -148,7 +165,7 @@ class TextToImage:
                 | structured_llm
             )
 
-            enhanced_prompt = chain.invoke({"prompt": prompt}).content
+            enhanced_prompt = (await chain.ainvoke({"prompt": prompt})).content
             self.logger.info(f"Enhanced prompt: '{enhanced_prompt}'")
 
             return enhanced_prompt
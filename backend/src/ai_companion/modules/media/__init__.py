@@ -0,0 +1,25 @@
+from .media_store import (
+    LocalMediaStore,
+    MediaStore,
+    SupabaseMediaStore,
+    get_media_store,
+    is_media_ref,
+    is_valid_digest,
+    media_url,
+    sniff_content_type,
+    verify_media_url,
+)
+from .retention import collect_media_garbage
+
+__all__ = [
+    "LocalMediaStore",
+    "MediaStore",
+    "SupabaseMediaStore",
+    "collect_media_garbage",
+    "get_media_store",
+    "is_media_ref",
+    "is_valid_digest",
+    "media_url",
+    "sniff_content_type",
+    "verify_media_url",
+]
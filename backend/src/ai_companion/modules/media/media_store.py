@@ -0,0 +1,246 @@
+import asyncio
+import hashlib
+import hmac
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from datetime import datetime
+from functools import lru_cache
+from typing import List, Optional, Tuple, Union
+
+from ai_companion.database.supabase import db
+from ai_companion.settings import settings
+
+MEDIA_REF_PREFIX = "media:"
+MEDIA_URL_PREFIX = "/api/media/"
+
+_DIGEST_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+
+
+def is_valid_digest(digest: str) -> bool:
+    """Check that a string is a lowercase hex SHA-256 digest."""
+    return bool(_DIGEST_PATTERN.match(digest))
+
+
+def is_media_ref(value: Optional[str]) -> bool:
+    """Check whether a message column holds a media store reference."""
+    return bool(value) and value.startswith(MEDIA_REF_PREFIX)
+
+
+def _media_signature(digest: str, expires: int) -> str:
+    secret = settings.MEDIA_URL_SECRET or os.getenv("SUPABASE_JWT_SECRET")
+    if not secret:
+        raise RuntimeError("MEDIA_URL_SECRET or SUPABASE_JWT_SECRET must be set to sign media URLs")
+    return hmac.new(
+        secret.encode("utf-8"), f"{digest}:{expires}".encode("ascii"), hashlib.sha256
+    ).hexdigest()
+
+
+def media_url(value: Optional[str]) -> Optional[str]:
+    """Turn a media reference into a signed, expiring URL it is served from.
+
+    The URL carries an HMAC over the digest and the expiry time, so only
+    clients that were handed it by an authenticated endpoint can load the
+    media, while `<img>` and `<audio>` tags still work without headers. The
+    expiry is rounded up to a MEDIA_URL_TTL_SECONDS boundary, so the URL of
+    a blob stays the same, and cacheable, for a while.
+
+    Values that are not references (e.g. base64 stored by older versions)
+    are returned unchanged.
+    """
+    if not is_media_ref(value):
+        return value
+    digest = value[len(MEDIA_REF_PREFIX) :]
+    ttl = settings.MEDIA_URL_TTL_SECONDS
+    expires = (int(time.time()) // ttl + 2) * ttl
+    return f"{MEDIA_URL_PREFIX}{digest}?expires={expires}&signature={_media_signature(digest, expires)}"
+
+
+def verify_media_url(digest: str, expires: int, signature: str) -> bool:
+    """Check that a media URL was issued by `media_url` and has not expired."""
+    if expires < time.time():
+        return False
+    return hmac.compare_digest(signature, _media_signature(digest, expires))
+
+
+def sniff_content_type(data: bytes) -> str:
+    """Guess the MIME type of a media blob from its leading bytes."""
+    if data.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "image/png"
+    if data.startswith(b"\xff\xd8\xff"):
+        return "image/jpeg"
+    if data.startswith((b"GIF87a", b"GIF89a")):
+        return "image/gif"
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "image/webp"
+    if data[:4] == b"RIFF" and data[8:12] == b"WAVE":
+        return "audio/wav"
+    if data.startswith(b"ID3") or data[:2] in (b"\xff\xfb", b"\xff\xf3", b"\xff\xf2"):
+        return "audio/mpeg"
+    if data.startswith(b"OggS"):
+        return "audio/ogg"
+    if data.startswith(b"\x1a\x45\xdf\xa3"):
+        return "audio/webm"
+    if data[4:8] == b"ftyp":
+        return "audio/mp4"
+    return "application/octet-stream"
+
+
+class LocalMediaStore:
+    """Content-addressed media store on the local filesystem.
+
+    Blobs are keyed by their SHA-256 digest and sharded into two levels of
+    sub-directories, so storing the same bytes twice is a no-op.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        self.logger = logging.getLogger(__name__)
+        # Orders storing a blob against garbage collection checking and deleting it
+        self._lock = threading.Lock()
+
+    def _path(self, digest: str) -> str:
+        return os.path.join(self.root, digest[:2], digest[2:4], digest)
+
+    def _write(self, digest: str, data: bytes) -> None:
+        path = self._path(digest)
+        with self._lock:
+            if os.path.exists(path):
+                # Storing the bytes again makes the blob recent, so garbage collection spares it
+                os.utime(path)
+                return
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write to a temporary file first so readers never see a partial blob
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            with self._lock:
+                os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def _read(self, digest: str) -> Optional[bytes]:
+        try:
+            with open(self._path(digest), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    async def put(self, data: bytes) -> str:
+        """Store a blob and return its reference."""
+        digest = hashlib.sha256(data).hexdigest()
+        await asyncio.to_thread(self._write, digest, data)
+        return MEDIA_REF_PREFIX + digest
+
+    async def get(self, digest: str) -> Optional[bytes]:
+        """Read a blob by digest, or None if it is not stored."""
+        return await asyncio.to_thread(self._read, digest)
+
+    def _list(self) -> List[Tuple[str, float]]:
+        blobs = []
+        for directory, _, files in os.walk(self.root):
+            for name in files:
+                if is_valid_digest(name):
+                    blobs.append((name, os.path.getmtime(os.path.join(directory, name))))
+        return blobs
+
+    async def list_blobs(self) -> List[Tuple[str, float]]:
+        """List stored blobs as (digest, last stored timestamp) pairs."""
+        return await asyncio.to_thread(self._list)
+
+    def _delete(self, digests: List[str], stored_before: Optional[float]) -> int:
+        deleted = 0
+        for digest in digests:
+            path = self._path(digest)
+            try:
+                with self._lock:
+                    if stored_before is None or os.path.getmtime(path) < stored_before:
+                        os.unlink(path)
+                        deleted += 1
+            except FileNotFoundError:
+                pass
+        return deleted
+
+    async def delete(self, digests: List[str], stored_before: Optional[float] = None) -> int:
+        """Delete blobs by digest; missing blobs are ignored.
+
+        Args:
+            digests: Blobs to delete
+            stored_before: If given, blobs stored again since this timestamp are kept
+
+        Returns:
+            int: Number of blobs deleted
+        """
+        return await asyncio.to_thread(self._delete, digests, stored_before)
+
+
+class SupabaseMediaStore:
+    """Content-addressed media store backed by a Supabase Storage bucket."""
+
+    def __init__(self, bucket: str):
+        self.bucket = bucket
+        self.logger = logging.getLogger(__name__)
+
+    @staticmethod
+    def _path(digest: str) -> str:
+        return f"{digest[:2]}/{digest}"
+
+    async def put(self, data: bytes) -> str:
+        """Store a blob and return its reference.
+
+        Storing bytes that are already stored refreshes the object's
+        timestamp, so garbage collection spares it.
+        """
+        digest = hashlib.sha256(data).hexdigest()
+        await db.upload_media(
+            self.bucket, self._path(digest), data, sniff_content_type(data)
+        )
+        return MEDIA_REF_PREFIX + digest
+
+    async def get(self, digest: str) -> Optional[bytes]:
+        """Read a blob by digest, or None if it is not stored."""
+        return await db.download_media(self.bucket, self._path(digest))
+
+    async def list_blobs(self) -> List[Tuple[str, float]]:
+        """List stored blobs as (digest, last stored timestamp) pairs."""
+        return [
+            (path.rsplit("/", 1)[-1], datetime.fromisoformat(stored_at).timestamp())
+            for path, stored_at in await db.list_media(self.bucket)
+            if is_valid_digest(path.rsplit("/", 1)[-1])
+        ]
+
+    async def delete(self, digests: List[str], stored_before: Optional[float] = None) -> int:
+        """Delete blobs by digest; missing blobs are ignored.
+
+        Args:
+            digests: Blobs to delete
+            stored_before: If given, blobs stored again since this timestamp are kept.
+                Their timestamps are re-read just before the delete request, which
+                leaves only the time that request takes for a store to slip in.
+
+        Returns:
+            int: Number of blobs deleted, or requested for deletion
+        """
+        if stored_before is not None:
+            stale = {digest for digest, stored_at in await self.list_blobs() if stored_at < stored_before}
+            digests = [digest for digest in digests if digest in stale]
+        if digests:
+            await db.delete_media(self.bucket, [self._path(digest) for digest in digests])
+        return len(digests)
+
+
+MediaStore = Union[LocalMediaStore, SupabaseMediaStore]
+
+
+@lru_cache
+def get_media_store() -> MediaStore:
+    """Get the media store selected by MEDIA_STORE_BACKEND."""
+    if settings.MEDIA_STORE_BACKEND == "supabase":
+        return SupabaseMediaStore(settings.MEDIA_STORE_BUCKET)
+    return LocalMediaStore(settings.MEDIA_STORE_PATH)
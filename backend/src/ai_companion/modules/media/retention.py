@@ -0,0 +1,76 @@
+import asyncio
+import logging
+import os
+import shutil
+import time
+
+from ai_companion.database.supabase import db
+from ai_companion.modules.media.media_store import MEDIA_REF_PREFIX, get_media_store
+from ai_companion.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Generated images were written here before they went straight to the media store
+LEGACY_GENERATED_IMAGES_DIR = "generated_images"
+
+
+async def collect_media_garbage(grace_period: float) -> int:
+    """Delete media blobs that no message references.
+
+    Blobs become unreferenced when their chat session is deleted, or when a
+    run stores media and then fails before saving its message. Blobs stored
+    within the grace period are kept, which covers media whose message is
+    still being written. Also removes the legacy `generated_images`
+    directory once its files are older than the grace period.
+
+    Args:
+        grace_period: Seconds a blob is kept after it was last stored
+
+    Returns:
+        int: Number of blobs deleted
+    """
+    cutoff = time.time() - grace_period
+
+    # Every store refreshes a blob's timestamp, also when the same bytes are stored again, and
+    # a message is saved after its media is stored. So a blob a new message is about to
+    # reference is recent, and is spared by the timestamp check the store repeats at delete
+    # time. That check is atomic with storing for the local store; for Supabase a store can
+    # still slip in while the delete request is in flight. References are read again after
+    # listing, so blobs whose message was saved meanwhile are kept regardless.
+    store = get_media_store()
+    referenced = {ref[len(MEDIA_REF_PREFIX) :] for ref in await db.get_media_refs()}
+    orphans = [
+        digest
+        for digest, stored_at in await store.list_blobs()
+        if digest not in referenced and stored_at < cutoff
+    ]
+    deleted = 0
+    if orphans:
+        referenced = {ref[len(MEDIA_REF_PREFIX) :] for ref in await db.get_media_refs()}
+        orphans = [digest for digest in orphans if digest not in referenced]
+        deleted = await store.delete(orphans, stored_before=cutoff)
+    logger.info(f"Media garbage collection deleted {deleted} unreferenced blob(s)")
+
+    await asyncio.to_thread(_remove_legacy_images, cutoff)
+    return deleted
+
+
+def _remove_legacy_images(cutoff: float) -> None:
+    if not os.path.isdir(LEGACY_GENERATED_IMAGES_DIR):
+        return
+    # Their messages hold a media store copy, so the files are no longer read
+    for entry in os.scandir(LEGACY_GENERATED_IMAGES_DIR):
+        if entry.is_file() and entry.stat().st_mtime < cutoff:
+            os.unlink(entry.path)
+    if not os.listdir(LEGACY_GENERATED_IMAGES_DIR):
+        shutil.rmtree(LEGACY_GENERATED_IMAGES_DIR, ignore_errors=True)
+
+
+async def run_media_garbage_collection() -> None:
+    """Collect media garbage every MEDIA_GC_INTERVAL_HOURS until cancelled."""
+    while True:
+        await asyncio.sleep(settings.MEDIA_GC_INTERVAL_HOURS * 3600)
+        try:
+            await collect_media_garbage(settings.MEDIA_GC_GRACE_HOURS * 3600)
+        except Exception as e:
+            logger.error(f"Media garbage collection failed: {str(e)}")
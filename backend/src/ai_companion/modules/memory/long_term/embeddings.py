@@ -0,0 +1,125 @@
+import logging
+from typing import TYPE_CHECKING, List, Sequence, Union
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from sentence_transformers import SentenceTransformer
+
+# Weight files published alongside the PyTorch weights in the sentence-transformers repos
+ONNX_MODEL_FILES = {
+    "onnx": "onnx/model.onnx",
+    # Dynamically quantized to int8; the AVX2 build runs on any x86-64 CPU from the last decade
+    "onnx-int8": "onnx/model_quint8_avx2.onnx",
+}
+
+
+class OnnxEmbeddingModel:
+    """Sentence embedding model run with ONNX Runtime instead of PyTorch.
+
+    Reproduces the sentence-transformers pipeline for MiniLM-style models
+    (tokenize, transformer, mean pooling, L2 normalization) without loading
+    torch, which cuts worker memory and per-call CPU time. Exposes the subset
+    of the `SentenceTransformer` interface that `VectorStore` uses.
+    """
+
+    def __init__(self, model_name: str, model_file: str, max_seq_length: int = 256):
+        # Imported here so workers on the torch engine never load ONNX Runtime
+        import onnxruntime
+        from huggingface_hub import hf_hub_download
+        from tokenizers import Tokenizer
+
+        self.logger = logging.getLogger(__name__)
+        repo_id = f"sentence-transformers/{model_name}"
+
+        self.tokenizer = Tokenizer.from_file(hf_hub_download(repo_id, "tokenizer.json"))
+        self.tokenizer.enable_truncation(max_length=max_seq_length)
+        self.tokenizer.enable_padding()
+
+        self.session = onnxruntime.InferenceSession(
+            hf_hub_download(repo_id, model_file),
+            providers=["CPUExecutionProvider"],
+        )
+        self._input_names = {model_input.name for model_input in self.session.get_inputs()}
+        self._dimension = int(self.encode([""]).shape[1])
+        self.logger.info(f"Loaded {repo_id}/{model_file} with ONNX Runtime")
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self._dimension
+
+    def encode(
+        self, sentences: Union[str, Sequence[str]], batch_size: int = 32
+    ) -> np.ndarray:
+        """Embed one sentence or a batch of sentences as unit-length float32 vectors."""
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+
+        batches = [
+            self._encode_batch(texts[i : i + batch_size])
+            for i in range(0, len(texts), batch_size)
+        ]
+        embeddings = np.concatenate(batches) if batches else np.empty((0, self._dimension), np.float32)
+        return embeddings[0] if single else embeddings
+
+    def _encode_batch(self, texts: List[str]) -> np.ndarray:
+        encodings = self.tokenizer.encode_batch(texts)
+        inputs = {
+            "input_ids": np.array([e.ids for e in encodings], dtype=np.int64),
+            "attention_mask": np.array([e.attention_mask for e in encodings], dtype=np.int64),
+            "token_type_ids": np.array([e.type_ids for e in encodings], dtype=np.int64),
+        }
+        token_embeddings = self.session.run(
+            None, {name: value for name, value in inputs.items() if name in self._input_names}
+        )[0]
+
+        # Mean over real tokens, then normalize, as the model's pooling and Normalize modules do
+        mask = inputs["attention_mask"][..., None].astype(np.float32)
+        pooled = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        norms = np.linalg.norm(pooled, axis=1, keepdims=True)
+        return (pooled / np.clip(norms, 1e-12, None)).astype(np.float32)
+
+
+EmbeddingModel = Union["SentenceTransformer", OnnxEmbeddingModel]
+
+
+def load_embedding_model(model_name: str, engine: str) -> EmbeddingModel:
+    """Load the sentence embedding model with the given engine.
+
+    Args:
+        model_name: Name of the sentence-transformers model, e.g. "all-MiniLM-L6-v2"
+        engine: "torch" for the default SentenceTransformer, or "onnx" / "onnx-int8"
+
+    Returns:
+        A model with `encode` and `get_sentence_embedding_dimension`
+    """
+    if engine == "torch":
+        # Imported here so the onnx engines never load torch
+        from sentence_transformers import SentenceTransformer
+
+        return SentenceTransformer(model_name)
+    return OnnxEmbeddingModel(model_name, ONNX_MODEL_FILES[engine])
+
+
+def top_k_agreement(
+    reference: EmbeddingModel,
+    candidate: EmbeddingModel,
+    corpus: List[str],
+    queries: List[str],
+    k: int = 3,
+) -> float:
+    """Measure how well a candidate engine reproduces a reference engine's retrieval.
+
+    Both models embed the same corpus and queries, and the cosine top-k for
+    each query is compared as a set.
+
+    Returns:
+        float: Mean fraction of the reference top-k also found by the candidate (1.0 is identical)
+    """
+    overlaps = []
+    reference_corpus, candidate_corpus = reference.encode(corpus), candidate.encode(corpus)
+    reference_queries, candidate_queries = reference.encode(queries), candidate.encode(queries)
+    for reference_query, candidate_query in zip(reference_queries, candidate_queries):
+        expected = set(np.argsort(-(reference_corpus @ reference_query))[:k])
+        actual = set(np.argsort(-(candidate_corpus @ candidate_query))[:k])
+        overlaps.append(len(expected & actual) / k)
+    return float(np.mean(overlaps))
@@ -0,0 +1,137 @@
+import asyncio
+import logging
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+from langchain_core.messages import BaseMessage
+
+from ai_companion.modules.memory.long_term.memory_manager import get_memory_manager
+from ai_companion.settings import settings
+
+
+@dataclass
+class MemoryExtractionStats:
+    """Counters for the background memory extraction pipeline."""
+
+    submitted: int = 0
+    dropped: int = 0
+    processed: int = 0
+    retried: int = 0
+    failed: int = 0
+
+
+class MemoryExtractionQueue:
+    """Bounded queue feeding memory extraction to background worker tasks.
+
+    The graph only enqueues the latest message, so the reply path never waits
+    for the memory-analysis LLM call or the vector store. When the queue is
+    full, submitters wait briefly and then drop the message rather than
+    stalling the conversation.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        workers: int,
+        max_retries: int,
+        enqueue_timeout: float,
+    ):
+        self.maxsize = maxsize
+        self.workers = workers
+        self.max_retries = max_retries
+        self.enqueue_timeout = enqueue_timeout
+        self.stats = MemoryExtractionStats()
+        self.logger = logging.getLogger(__name__)
+        self._queue: Optional[asyncio.Queue[Tuple[BaseMessage, str]]] = None
+        self._tasks: List[asyncio.Task] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _ensure_started(self) -> None:
+        """Start the workers on the running event loop if they are not running yet."""
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and self._tasks:
+            return
+
+        self._loop = loop
+        self._queue = asyncio.Queue(maxsize=self.maxsize)
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"memory-extraction-{i}")
+            for i in range(self.workers)
+        ]
+
+    async def submit(self, message: BaseMessage, user_id: str) -> bool:
+        """Queue a message for memory extraction.
+
+        Args:
+            message: The message to analyze
+            user_id: The user the extracted memories belong to
+
+        Returns:
+            bool: False if the message was dropped because the queue stayed full
+        """
+        self._ensure_started()
+        try:
+            await asyncio.wait_for(self._queue.put((message, user_id)), timeout=self.enqueue_timeout)
+        except asyncio.TimeoutError:
+            self.stats.dropped += 1
+            self.logger.warning("Memory extraction queue is full, dropping message")
+            return False
+
+        self.stats.submitted += 1
+        return True
+
+    async def _worker(self) -> None:
+        memory_manager = get_memory_manager()
+        while True:
+            message, user_id = await self._queue.get()
+            try:
+                for attempt in range(self.max_retries + 1):
+                    try:
+                        await memory_manager.extract_and_store_memories(message, user_id)
+                        self.stats.processed += 1
+                        break
+                    except Exception as e:
+                        if attempt == self.max_retries:
+                            self.stats.failed += 1
+                            self.logger.error(f"Memory extraction failed: {str(e)}")
+                        else:
+                            self.stats.retried += 1
+                            await asyncio.sleep(2**attempt)
+            finally:
+                self._queue.task_done()
+
+    async def stop(self, timeout: Optional[float] = None) -> None:
+        """Wait for queued messages to be processed, then stop the workers."""
+        if not self._tasks:
+            return
+
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout=timeout)
+        except asyncio.TimeoutError:
+            self.logger.warning(
+                f"Stopping memory extraction with {self._queue.qsize()} message(s) pending"
+            )
+
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def get_stats(self) -> dict:
+        """Get the pipeline counters and current queue depth."""
+        return {
+            **asdict(self.stats),
+            "queued": self._queue.qsize() if self._queue else 0,
+        }
+
+
+@lru_cache
+def get_memory_extraction_queue() -> MemoryExtractionQueue:
+    """Get or create the MemoryExtractionQueue singleton instance."""
+    return MemoryExtractionQueue(
+        maxsize=settings.MEMORY_EXTRACTION_QUEUE_SIZE,
+        workers=settings.MEMORY_EXTRACTION_WORKERS,
+        max_retries=settings.MEMORY_EXTRACTION_MAX_RETRIES,
+        enqueue_timeout=settings.MEMORY_EXTRACTION_ENQUEUE_TIMEOUT,
+    )
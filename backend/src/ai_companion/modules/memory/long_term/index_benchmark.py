@@ -0,0 +1,193 @@
+"""Search latency of the local flat index against Qdrant on synthetic memories.
+
+Random unit vectors of the embedding size are stored for a single user, the
+worst case for the flat index since every search scans that user's whole
+matrix. Both indexes answer the same queries; the local index is exact, so
+its results are the reference for Qdrant's recall.
+
+Qdrant runs against the server at `qdrant_url` with the same collection settings
+as production when `qdrant_url` is given, and otherwise in the client's
+local mode, which is far slower than a server and only practical up to
+about 100k points (pass `qdrant_max_points` to cap it).
+
+    from ai_companion.modules.memory.long_term.index_benchmark import run_benchmark
+    from ai_companion.settings import settings
+
+    for size in (1_000, 100_000, 1_000_000):
+        print(run_benchmark(size, qdrant_url=settings.QDRANT_URL).summary())
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import numpy as np
+from qdrant_client import QdrantClient
+from qdrant_client.models import PointStruct
+
+from ai_companion.core.helpers import clean_env_var
+from ai_companion.modules.memory.long_term.qdrant_index import QdrantVectorIndex
+from ai_companion.modules.memory.long_term.vector_index import USER_ID_FIELD, LocalVectorIndex
+from ai_companion.settings import settings
+
+BENCHMARK_USER_ID = "benchmark-user"
+QDRANT_BATCH_SIZE = 1000
+EMBEDDING_DIMENSION = 384  # Output size of VectorStore.EMBEDDING_MODEL
+
+
+@dataclass
+class IndexTimings:
+    """Load time and per-query search latencies of one index."""
+
+    load_seconds: float = 0.0
+    query_ms: List[float] = field(default_factory=list)
+
+    def summary(self) -> Dict:
+        return {
+            "load_seconds": round(self.load_seconds, 2),
+            "mean_query_ms": round(float(np.mean(self.query_ms)), 3),
+            "p95_query_ms": round(float(np.percentile(self.query_ms, 95)), 3),
+        }
+
+
+@dataclass
+class IndexBenchmark:
+    size: int
+    local: IndexTimings
+    qdrant: Optional[IndexTimings] = None
+    qdrant_mode: Optional[str] = None  # "server" or "local", None when Qdrant was skipped
+    qdrant_recall: Optional[float] = None  # Share of the exact top-k Qdrant also returned
+
+    def summary(self) -> Dict:
+        return {
+            "size": self.size,
+            "local": self.local.summary(),
+            "qdrant": self.qdrant.summary() if self.qdrant else None,
+            "qdrant_mode": self.qdrant_mode,
+            "qdrant_recall": round(self.qdrant_recall, 4) if self.qdrant_recall is not None else None,
+        }
+
+
+def _random_unit_vectors(rng: np.random.Generator, count: int, dimension: int) -> np.ndarray:
+    vectors = rng.standard_normal((count, dimension), dtype=np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def _benchmark_local(vectors: np.ndarray, ids: List[str], queries: np.ndarray, limit: int):
+    directory = tempfile.mkdtemp(prefix="index-benchmark-")
+    try:
+        # Write the log directly in the index's on-disk format, then time loading it
+        with open(os.path.join(directory, LocalVectorIndex.VECTORS_FILE), "wb") as f:
+            f.write(vectors.tobytes())
+        with open(os.path.join(directory, LocalVectorIndex.POINTS_FILE), "w", encoding="utf-8") as f:
+            for point_id in ids:
+                f.write(json.dumps({"id": point_id, "payload": {USER_ID_FIELD: BENCHMARK_USER_ID}}) + "\n")
+
+        index = LocalVectorIndex(directory, vectors.shape[1])
+        timings = IndexTimings()
+        start = time.perf_counter()
+        index.ensure_collection()
+        timings.load_seconds = time.perf_counter() - start
+
+        results = []
+        for query in queries:
+            start = time.perf_counter()
+            hits = index.search(query.tolist(), BENCHMARK_USER_ID, limit)
+            timings.query_ms.append((time.perf_counter() - start) * 1000)
+            results.append([hit.id for hit in hits])
+        if index._lock_file is not None:
+            index._lock_file.close()
+        return timings, results
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def _benchmark_qdrant(
+    vectors: np.ndarray,
+    ids: List[str],
+    queries: np.ndarray,
+    limit: int,
+    qdrant_url: Optional[str],
+):
+    collection_name = f"index_benchmark_{uuid.uuid4().hex[:8]}"
+    index = QdrantVectorIndex(collection_name, vectors.shape[1], settings.EMBEDDING_VECTOR_DTYPE)
+    index.client = (
+        QdrantClient(url=qdrant_url, api_key=clean_env_var(settings.QDRANT_API_KEY))
+        if qdrant_url
+        else QdrantClient(location=":memory:")
+    )
+
+    timings = IndexTimings()
+    try:
+        start = time.perf_counter()
+        index.ensure_collection()
+        payload = {USER_ID_FIELD: BENCHMARK_USER_ID}
+        for offset in range(0, len(ids), QDRANT_BATCH_SIZE):
+            index.client.upsert(
+                collection_name=collection_name,
+                points=[
+                    PointStruct(id=point_id, vector=vector.tolist(), payload=payload)
+                    for point_id, vector in zip(
+                        ids[offset : offset + QDRANT_BATCH_SIZE],
+                        vectors[offset : offset + QDRANT_BATCH_SIZE],
+                    )
+                ],
+                wait=True,
+            )
+        timings.load_seconds = time.perf_counter() - start
+
+        results = []
+        for query in queries:
+            start = time.perf_counter()
+            hits = index.search(query.tolist(), BENCHMARK_USER_ID, limit)
+            timings.query_ms.append((time.perf_counter() - start) * 1000)
+            results.append([hit.id for hit in hits])
+        return timings, results
+    finally:
+        index.client.delete_collection(collection_name)
+
+
+def run_benchmark(
+    size: int,
+    queries: int = 50,
+    limit: int = 5,
+    dimension: int = EMBEDDING_DIMENSION,
+    qdrant_url: Optional[str] = None,
+    qdrant_max_points: Optional[int] = None,
+    seed: int = 0,
+) -> IndexBenchmark:
+    """Load `size` points into both indexes and time the same searches on each.
+
+    Args:
+        size: Number of points stored for the benchmark user
+        queries: Number of searches to time
+        limit: Number of results per search
+        dimension: Vector size, by default that of the embedding model
+        qdrant_url: Qdrant server to benchmark; None uses the client's local mode
+        qdrant_max_points: Skip Qdrant above this size, e.g. for local mode
+        seed: Seed for the random vectors
+
+    Returns:
+        IndexBenchmark with load times, query latencies and Qdrant's recall
+    """
+    rng = np.random.default_rng(seed)
+    vectors = _random_unit_vectors(rng, size, dimension)
+    query_vectors = _random_unit_vectors(rng, queries, dimension)
+    ids = [str(uuid.UUID(int=int(i), version=4)) for i in range(size)]
+
+    local, exact = _benchmark_local(vectors, ids, query_vectors, limit)
+    benchmark = IndexBenchmark(size=size, local=local)
+    if qdrant_max_points is not None and size > qdrant_max_points:
+        return benchmark
+
+    benchmark.qdrant, approximate = _benchmark_qdrant(vectors, ids, query_vectors, limit, qdrant_url)
+    benchmark.qdrant_mode = "server" if qdrant_url else "local"
+    benchmark.qdrant_recall = float(
+        np.mean([len(set(a) & set(e)) / len(e) for a, e in zip(approximate, exact)])
+    )
+    return benchmark
@@ -1,14 +1,13 @@
 import logging
 import uuid
 from datetime import datetime
+from functools import lru_cache
 from typing import List, Optional
 
 from langchain_core.messages import BaseMessage
-from langchain_groq import ChatGroq
 from pydantic import BaseModel, Field
 
 from ai_companion.core.prompts import MEMORY_ANALYSIS_PROMPT
-from ai_companion.core.helpers import clean_env_var
 from ai_companion.modules.memory.long_term.vector_store import get_vector_store
 from ai_companion.settings import settings
 
@@ -31,48 +30,57 @@ class MemoryManager:
     def __init__(self):
         self.vector_store = get_vector_store()
         self.logger = logging.getLogger(__name__)
-        self.llm = ChatGroq(
-            model=clean_env_var(settings.SMALL_TEXT_MODEL_NAME),
-            api_key=clean_env_var(settings.GROQ_API_KEY),
-            temperature=0.1,
-            max_retries=2,
-        ).with_structured_output(MemoryAnalysis)
+
+        from ai_companion.graph.utils.helpers import get_chain_model
+
+        self.llm = get_chain_model("memory_analysis", temperature=0.1).with_structured_output(
+            MemoryAnalysis
+        )
 
     async def _analyze_memory(self, message: str) -> MemoryAnalysis:
         """Analyze a message to determine importance and format if needed."""
         prompt = MEMORY_ANALYSIS_PROMPT.format(message=message)
         return await self.llm.ainvoke(prompt)
 
-    async def extract_and_store_memories(self, message: BaseMessage) -> None:
-        """Extract important information from a message and store in vector store."""
+    async def extract_and_store_memories(self, message: BaseMessage, user_id: str) -> None:
+        """Extract important information from a message and store it under the user's memories."""
         if message.type != "human":
             return
 
         # Analyze the message for importance and formatting
         analysis = await self._analyze_memory(message.content)
         if analysis.is_important and analysis.formatted_memory:
-            # Check if similar memory exists
-            similar = self.vector_store.find_similar_memory(analysis.formatted_memory)
-            if similar:
-                # Skip storage if we already have a similar memory
-                self.logger.info(
-                    f"Similar memory already exists: '{analysis.formatted_memory}'"
-                )
-                return
-
-            # Store new memory
-            self.logger.info(f"Storing new memory: '{analysis.formatted_memory}'")
-            self.vector_store.store_memory(
+            # Store the memory, or merge it into an existing similar one
+            result = await self.vector_store.aupsert_memory(
                 text=analysis.formatted_memory,
                 metadata={
                     "id": str(uuid.uuid4()),
                     "timestamp": datetime.now().isoformat(),
                 },
+                user_id=user_id,
             )
+            if result.inserted:
+                self.logger.info(f"Stored new memory: '{analysis.formatted_memory}'")
+            else:
+                self.logger.info(
+                    f"Merged into similar existing memory: '{analysis.formatted_memory}'"
+                )
+
+    def get_relevant_memories(self, context: str, user_id: str) -> List[str]:
+        """Retrieve the user's memories relevant to the current context."""
+        memories = self.vector_store.search_memories(context, user_id, k=settings.MEMORY_TOP_K)
+        if memories:
+            for memory in memories:
+                self.logger.debug(
+                    f"Memory: '{memory.text}' (score: {memory.score:.2f})"
+                )
+        return [memory.text for memory in memories]
 
-    def get_relevant_memories(self, context: str) -> List[str]:
-        """Retrieve relevant memories based on the current context."""
-        memories = self.vector_store.search_memories(context, k=settings.MEMORY_TOP_K)
+    async def aget_relevant_memories(self, context: str, user_id: str) -> List[str]:
+        """Async version of `get_relevant_memories`."""
+        memories = await self.vector_store.asearch_memories(
+            context, user_id, k=settings.MEMORY_TOP_K
+        )
         if memories:
             for memory in memories:
                 self.logger.debug(
@@ -87,6 +95,7 @@ class MemoryManager:
         return "\n".join(f"- {memory}" for memory in memories)
 
 
+@lru_cache
 def get_memory_manager() -> MemoryManager:
-    """Get a MemoryManager instance."""
+    """Get or create the MemoryManager singleton instance."""
     return MemoryManager()
@@ -0,0 +1,194 @@
+from typing import Awaitable, Callable, List, Optional, TypeVar
+
+from qdrant_client import AsyncQdrantClient, QdrantClient
+from qdrant_client.http.exceptions import UnexpectedResponse
+from qdrant_client.models import (
+    Datatype,
+    Distance,
+    FieldCondition,
+    Filter,
+    HnswConfigDiff,
+    KeywordIndexParams,
+    KeywordIndexType,
+    MatchValue,
+    PointStruct,
+    ScalarQuantization,
+    ScalarQuantizationConfig,
+    ScalarType,
+    VectorParams,
+)
+
+from ai_companion.core.helpers import clean_env_var
+from ai_companion.modules.memory.long_term.vector_index import USER_ID_FIELD, IndexHit
+from ai_companion.settings import settings
+
+T = TypeVar("T")
+
+
+class QdrantVectorIndex:
+    """Vector index stored in a Qdrant collection, partitioned by user_id."""
+
+    def __init__(self, collection_name: str, vector_size: int, vector_dtype: str = "float32"):
+        self.collection_name = collection_name
+        self.vector_size = vector_size
+        self.vector_dtype = vector_dtype
+        self.client = QdrantClient(
+            url=clean_env_var(settings.QDRANT_URL), api_key=clean_env_var(settings.QDRANT_API_KEY)
+        )
+        self.async_client = AsyncQdrantClient(
+            url=clean_env_var(settings.QDRANT_URL), api_key=clean_env_var(settings.QDRANT_API_KEY)
+        )
+        # Set once the collection is known to exist; only reset when Qdrant reports it missing
+        self._collection_ready = False
+
+    @property
+    def _vectors_config(self) -> VectorParams:
+        return VectorParams(
+            size=self.vector_size,
+            distance=Distance.COSINE,
+            datatype=Datatype.FLOAT16 if self.vector_dtype == "float16" else Datatype.FLOAT32,
+        )
+
+    @property
+    def _quantization_config(self) -> Optional[ScalarQuantization]:
+        if self.vector_dtype != "int8":
+            return None
+        # Search runs on in-RAM int8 copies; the float32 originals are kept for rescoring
+        return ScalarQuantization(
+            scalar=ScalarQuantizationConfig(type=ScalarType.INT8, quantile=0.99, always_ram=True)
+        )
+
+    @property
+    def _hnsw_config(self) -> HnswConfigDiff:
+        # Every search is filtered by user, so build per-user graphs (payload_m)
+        # instead of one global graph (m=0)
+        return HnswConfigDiff(m=0, payload_m=16)
+
+    @property
+    def _user_id_index(self) -> KeywordIndexParams:
+        # is_tenant lets Qdrant co-locate each user's points on disk
+        return KeywordIndexParams(type=KeywordIndexType.KEYWORD, is_tenant=True)
+
+    @staticmethod
+    def _user_filter(user_id: str) -> Filter:
+        return Filter(must=[FieldCondition(key=USER_ID_FIELD, match=MatchValue(value=user_id))])
+
+    @staticmethod
+    def _to_hits(results) -> List[IndexHit]:
+        return [IndexHit(id=str(hit.id), score=hit.score, payload=hit.payload) for hit in results]
+
+    def ensure_collection(self) -> None:
+        """Create the collection and its user_id index if needed.
+
+        Only hits Qdrant until it succeeds once.
+        """
+        if self._collection_ready:
+            return
+        if not self.client.collection_exists(self.collection_name):
+            self.client.create_collection(
+                collection_name=self.collection_name,
+                vectors_config=self._vectors_config,
+                hnsw_config=self._hnsw_config,
+                quantization_config=self._quantization_config,
+            )
+        # Idempotent, so collections created by older versions get the index too
+        self.client.create_payload_index(
+            collection_name=self.collection_name,
+            field_name=USER_ID_FIELD,
+            field_schema=self._user_id_index,
+        )
+        self._collection_ready = True
+
+    async def aensure_collection(self) -> None:
+        """Async version of `ensure_collection`."""
+        if self._collection_ready:
+            return
+        if not await self.async_client.collection_exists(self.collection_name):
+            await self.async_client.create_collection(
+                collection_name=self.collection_name,
+                vectors_config=self._vectors_config,
+                hnsw_config=self._hnsw_config,
+                quantization_config=self._quantization_config,
+            )
+        await self.async_client.create_payload_index(
+            collection_name=self.collection_name,
+            field_name=USER_ID_FIELD,
+            field_schema=self._user_id_index,
+        )
+        self._collection_ready = True
+
+    def _with_collection(self, operation: Callable[[], T]) -> T:
+        """Run a Qdrant operation, re-creating the collection once if it has disappeared."""
+        self.ensure_collection()
+        try:
+            return operation()
+        except UnexpectedResponse as e:
+            if e.status_code != 404:
+                raise
+            self._collection_ready = False
+            self.ensure_collection()
+            return operation()
+
+    async def _awith_collection(self, operation: Callable[[], Awaitable[T]]) -> T:
+        """Async version of `_with_collection`."""
+        await self.aensure_collection()
+        try:
+            return await operation()
+        except UnexpectedResponse as e:
+            if e.status_code != 404:
+                raise
+            self._collection_ready = False
+            await self.aensure_collection()
+            return await operation()
+
+    def search(
+        self,
+        vector: List[float],
+        user_id: str,
+        limit: int,
+        score_threshold: Optional[float] = None,
+    ) -> List[IndexHit]:
+        """Find the user's points closest to a vector, best first."""
+        results = self._with_collection(
+            lambda: self.client.search(
+                collection_name=self.collection_name,
+                query_vector=vector,
+                query_filter=self._user_filter(user_id),
+                limit=limit,
+                score_threshold=score_threshold,
+            )
+        )
+        return self._to_hits(results)
+
+    def upsert(self, point_id: str, vector: List[float], payload: dict) -> None:
+        """Insert a point, or replace the point with the same ID."""
+        point = PointStruct(id=point_id, vector=vector, payload=payload)
+        self._with_collection(
+            lambda: self.client.upsert(collection_name=self.collection_name, points=[point])
+        )
+
+    async def asearch(
+        self,
+        vector: List[float],
+        user_id: str,
+        limit: int,
+        score_threshold: Optional[float] = None,
+    ) -> List[IndexHit]:
+        """Async version of `search`."""
+        results = await self._awith_collection(
+            lambda: self.async_client.search(
+                collection_name=self.collection_name,
+                query_vector=vector,
+                query_filter=self._user_filter(user_id),
+                limit=limit,
+                score_threshold=score_threshold,
+            )
+        )
+        return self._to_hits(results)
+
+    async def aupsert(self, point_id: str, vector: List[float], payload: dict) -> None:
+        """Async version of `upsert`."""
+        point = PointStruct(id=point_id, vector=vector, payload=payload)
+        await self._awith_collection(
+            lambda: self.async_client.upsert(collection_name=self.collection_name, points=[point])
+        )
@@ -0,0 +1,308 @@
+import asyncio
+import errno
+import json
+import logging
+import os
+import shutil
+import threading
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, List, Optional, Union
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows has no flock; the single-process rule is then not enforced
+    fcntl = None
+
+if TYPE_CHECKING:
+    from ai_companion.modules.memory.long_term.qdrant_index import QdrantVectorIndex
+
+USER_ID_FIELD = "user_id"  # Payload field every memory is partitioned by
+
+
+@dataclass
+class IndexHit:
+    """A search result from a vector index."""
+
+    id: str
+    score: float
+    payload: dict
+
+
+class _Partition:
+    """One user's vectors as a contiguous, growable matrix of unit-length rows."""
+
+    def __init__(self, vector_size: int):
+        self.vectors = np.empty((16, vector_size), dtype=np.float32)
+        self.ids: List[str] = []
+        self.payloads: List[dict] = []
+        self.slots: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def put(self, point_id: str, vector: np.ndarray, payload: dict) -> None:
+        slot = self.slots.get(point_id)
+        if slot is None:
+            slot = len(self.ids)
+            if slot == len(self.vectors):
+                self.vectors = np.concatenate([self.vectors, np.empty_like(self.vectors)])
+            self.ids.append(point_id)
+            self.payloads.append(payload)
+            self.slots[point_id] = slot
+        else:
+            self.payloads[slot] = payload
+        self.vectors[slot] = vector
+
+    def remove(self, point_id: str) -> None:
+        # Move the last row into the freed slot to keep the matrix dense
+        slot = self.slots.pop(point_id)
+        last = len(self.ids) - 1
+        if slot != last:
+            self.vectors[slot] = self.vectors[last]
+            self.ids[slot] = self.ids[last]
+            self.payloads[slot] = self.payloads[last]
+            self.slots[self.ids[slot]] = slot
+        self.ids.pop()
+        self.payloads.pop()
+
+
+class LocalVectorIndex:
+    """In-process flat vector index persisted to a directory.
+
+    Each user's vectors are kept as one dense matrix, so a search is a single
+    matrix-vector product over that user's memories followed by a partial
+    sort. On disk the index is an append-only log: `vectors.f32` holds raw
+    float32 rows and `points.jsonl` the matching point ID and payload, one
+    line per row. Replacing a point appends a new row; the latest row for an
+    ID wins when the log is replayed, and the log is compacted on load once
+    superseded rows outnumber live ones.
+
+    Compaction writes the live rows to a new generation directory and then
+    switches the `CURRENT` pointer file to it, so a crash leaves either the
+    old or the new pair of files in use, never a mix. Without a pointer the
+    files are read from the index directory itself.
+
+    The index is single-process only: every process keeps its own copy in
+    memory and would never see the others' writes. The first process to load
+    the directory holds an exclusive lock on it for its lifetime, and any
+    other process fails to load it, so run a single worker or use Qdrant.
+    """
+
+    VECTORS_FILE = "vectors.f32"
+    POINTS_FILE = "points.jsonl"
+    LOCK_FILE = "index.lock"
+    CURRENT_FILE = "CURRENT"  # Names the generation directory holding the live files
+
+    def __init__(self, path: str, vector_size: int):
+        self.path = path
+        self.vector_size = vector_size
+        self.logger = logging.getLogger(__name__)
+        self._partitions: Dict[str, _Partition] = {}
+        self._owners: Dict[str, str] = {}  # point ID -> user_id
+        self._rows = 0
+        self._lock = threading.Lock()
+        self._lock_file = None  # Held open while this process owns the directory
+        self._generation = ""  # Sub-directory of `path` holding the live files
+        self._collection_ready = False
+
+    @property
+    def _vectors_path(self) -> str:
+        return os.path.join(self.path, self._generation, self.VECTORS_FILE)
+
+    @property
+    def _points_path(self) -> str:
+        return os.path.join(self.path, self._generation, self.POINTS_FILE)
+
+    def _put(self, point_id: str, vector: np.ndarray, payload: dict) -> None:
+        user_id = payload[USER_ID_FIELD]
+        owner = self._owners.get(point_id)
+        if owner is not None and owner != user_id:
+            self._partitions[owner].remove(point_id)
+        partition = self._partitions.get(user_id)
+        if partition is None:
+            partition = self._partitions[user_id] = _Partition(self.vector_size)
+        partition.put(point_id, vector, payload)
+        self._owners[point_id] = user_id
+
+    def _acquire_directory(self) -> None:
+        if fcntl is None:
+            return
+        lock_file = open(os.path.join(self.path, self.LOCK_FILE), "a")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError as e:
+            lock_file.close()
+            if e.errno not in (errno.EAGAIN, errno.EACCES):
+                raise
+            raise RuntimeError(
+                f"Local vector index at {self.path} is in use by another process; it is "
+                "single-process only, so run one worker or set VECTOR_STORE_BACKEND=qdrant"
+            ) from e
+        self._lock_file = lock_file
+
+    def _load(self) -> None:
+        os.makedirs(self.path, exist_ok=True)
+        self._acquire_directory()
+        try:
+            with open(os.path.join(self.path, self.CURRENT_FILE), "r", encoding="utf-8") as f:
+                self._generation = f.read().strip()
+        except FileNotFoundError:
+            self._generation = ""
+        if not os.path.exists(self._points_path):
+            return
+
+        with open(self._points_path, "r", encoding="utf-8") as f:
+            points = [json.loads(line) for line in f if line.endswith("\n")]
+        row_size = 4 * self.vector_size
+        vectors_size = os.path.getsize(self._vectors_path) if os.path.exists(self._vectors_path) else 0
+        vector_count = vectors_size // row_size
+
+        # A crash between or during the two appends leaves one file a row ahead, or a
+        # partial row at the end of the vectors; drop them, then rewrite the files below
+        # so the next append starts at a row boundary
+        self._rows = min(len(points), vector_count)
+        if self._rows:
+            vectors = np.memmap(
+                self._vectors_path, dtype=np.float32, mode="r", shape=(self._rows, self.vector_size)
+            )
+            for point, vector in zip(points, vectors):
+                self._put(point["id"], vector, point["payload"])
+            del vectors
+
+        if (
+            self._rows != len(points)
+            or vectors_size != self._rows * row_size
+            or self._rows > 2 * len(self._owners)
+        ):
+            self._compact()
+
+    def _compact(self) -> None:
+        """Rewrite the log with only the live rows, into a new generation."""
+        self.logger.info(f"Compacting local vector index ({self._rows} rows, {len(self._owners)} live)")
+        previous = self._generation
+        generation = f"gen-{int(previous[4:]) + 1 if previous.startswith('gen-') else 1}"
+        directory = os.path.join(self.path, generation)
+        # Left over if a compaction crashed before switching to it
+        shutil.rmtree(directory, ignore_errors=True)
+        os.makedirs(directory)
+
+        with open(os.path.join(directory, self.VECTORS_FILE), "wb") as vf, open(
+            os.path.join(directory, self.POINTS_FILE), "w", encoding="utf-8"
+        ) as pf:
+            for partition in self._partitions.values():
+                vf.write(partition.vectors[: len(partition)].tobytes())
+                for point_id, payload in zip(partition.ids, partition.payloads):
+                    pf.write(json.dumps({"id": point_id, "payload": payload}) + "\n")
+            for f in (vf, pf):
+                f.flush()
+                os.fsync(f.fileno())
+
+        # Switching the pointer is the single atomic step that moves both files
+        current_tmp = os.path.join(self.path, self.CURRENT_FILE + ".tmp")
+        with open(current_tmp, "w", encoding="utf-8") as f:
+            f.write(generation)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(current_tmp, os.path.join(self.path, self.CURRENT_FILE))
+        self._generation = generation
+        self._rows = len(self._owners)
+
+        if previous:
+            shutil.rmtree(os.path.join(self.path, previous), ignore_errors=True)
+        else:
+            for name in (self.VECTORS_FILE, self.POINTS_FILE):
+                try:
+                    os.unlink(os.path.join(self.path, name))
+                except FileNotFoundError:
+                    pass
+
+    def ensure_collection(self) -> None:
+        """Load the index from disk the first time it is used."""
+        if self._collection_ready:
+            return
+        with self._lock:
+            if not self._collection_ready:
+                self._load()
+                self._collection_ready = True
+
+    async def aensure_collection(self) -> None:
+        """Async version of `ensure_collection`."""
+        if not self._collection_ready:
+            await asyncio.to_thread(self.ensure_collection)
+
+    def search(
+        self,
+        vector: List[float],
+        user_id: str,
+        limit: int,
+        score_threshold: Optional[float] = None,
+    ) -> List[IndexHit]:
+        """Find the user's points closest to a vector by cosine similarity, best first."""
+        self.ensure_collection()
+        query = np.asarray(vector, dtype=np.float32)
+        query = query / (np.linalg.norm(query) or 1.0)
+
+        with self._lock:
+            partition = self._partitions.get(user_id)
+            if not partition:
+                return []
+            scores = partition.vectors[: len(partition)] @ query
+
+            if limit < len(scores):
+                top = np.argpartition(-scores, limit - 1)[:limit]
+            else:
+                top = np.arange(len(scores))
+            top = top[np.argsort(-scores[top])]
+            if score_threshold is not None:
+                top = top[scores[top] >= score_threshold]
+
+            return [
+                IndexHit(id=partition.ids[i], score=float(scores[i]), payload=partition.payloads[i])
+                for i in top
+            ]
+
+    def upsert(self, point_id: str, vector: List[float], payload: dict) -> None:
+        """Insert a point, or replace the point with the same ID."""
+        self.ensure_collection()
+        row = np.asarray(vector, dtype=np.float32)
+        row = row / (np.linalg.norm(row) or 1.0)
+
+        with self._lock:
+            sizes = {
+                path: os.path.getsize(path) if os.path.exists(path) else 0
+                for path in (self._vectors_path, self._points_path)
+            }
+            try:
+                with open(self._vectors_path, "ab") as f:
+                    f.write(row.tobytes())
+                with open(self._points_path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps({"id": point_id, "payload": payload}) + "\n")
+            except BaseException:
+                # Undo a half-written point so later rows stay aligned with their points
+                for path, size in sizes.items():
+                    try:
+                        os.truncate(path, size)
+                    except OSError as e:
+                        self.logger.error(f"Failed to roll back local vector index file {path}: {e}")
+                raise
+            self._rows += 1
+            self._put(point_id, row, payload)
+
+    async def asearch(
+        self,
+        vector: List[float],
+        user_id: str,
+        limit: int,
+        score_threshold: Optional[float] = None,
+    ) -> List[IndexHit]:
+        """Async version of `search`."""
+        return await asyncio.to_thread(self.search, vector, user_id, limit, score_threshold)
+
+    async def aupsert(self, point_id: str, vector: List[float], payload: dict) -> None:
+        """Async version of `upsert`."""
+        await asyncio.to_thread(self.upsert, point_id, vector, payload)
+
+
+VectorIndex = Union["QdrantVectorIndex", LocalVectorIndex]
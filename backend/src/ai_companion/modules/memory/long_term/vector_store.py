@@ -1,16 +1,27 @@
+import asyncio
+import hashlib
 import os
-from typing import Optional, List
+import sqlite3
+import threading
+import unicodedata
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, List, Set, Tuple
 from functools import lru_cache
 from dataclasses import dataclass
 from datetime import datetime
 
-from qdrant_client import QdrantClient
-from qdrant_client.models import Distance, VectorParams, PointStruct
-from sentence_transformers import SentenceTransformer
+import numpy as np
 
+from ai_companion.modules.memory.long_term.embeddings import EmbeddingModel, load_embedding_model
+from ai_companion.modules.memory.long_term.vector_index import (
+    USER_ID_FIELD,
+    IndexHit,
+    LocalVectorIndex,
+    VectorIndex,
+)
 from ai_companion.settings import settings
-from ai_companion.core.helpers import clean_env_var
-
 
 
 @dataclass
@@ -31,8 +42,201 @@ class Memory:
         return datetime.fromisoformat(ts) if ts else None
 
 
+@dataclass
+class UpsertResult:
+    """Outcome of a dedupe-or-upsert write."""
+
+    id: str
+    inserted: bool  # False when the text was merged into an existing similar memory
+
+
+class EmbeddingCache:
+    """LRU cache of embeddings keyed by model name and normalized text.
+
+    Entries live in memory and, if `db_path` is given, also in a SQLite file
+    that survives restarts and is shared by all workers on the host. Lookups
+    that miss memory but hit disk are promoted back into memory.
+    """
+
+    def __init__(self, model_name: str, max_entries: int, db_path: Optional[str] = None):
+        self.model_name = model_name
+        self.max_entries = max_entries
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, np.ndarray] = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        if db_path:
+            os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+            )
+            self._db.commit()
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """Normalize text so trivially different inputs share an entry.
+
+        Lowercasing is safe because all-MiniLM-L6-v2 uses an uncased tokenizer.
+        """
+        return " ".join(unicodedata.normalize("NFKC", text).split()).lower()
+
+    def key(self, text: str) -> str:
+        return hashlib.sha256(f"{self.model_name}\0{self.normalize(text)}".encode("utf-8")).hexdigest()
+
+    def get_memory(self, key: str) -> Optional[np.ndarray]:
+        """Look up the in-memory tier only (cheap enough for the event loop)."""
+        with self._lock:
+            embedding = self._entries.get(key)
+            if embedding is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            return embedding
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        """Look up the in-memory tier, then the on-disk tier."""
+        embedding = self.get_memory(key)
+        if embedding is not None or self._db is None:
+            if embedding is None:
+                with self._lock:
+                    self.misses += 1
+            return embedding
+
+        with self._lock:
+            row = self._db.execute("SELECT vector FROM embeddings WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+        embedding = np.frombuffer(row[0], dtype=np.float32)
+        self._remember(key, embedding)
+        return embedding
+
+    def put(self, key: str, embedding: np.ndarray) -> None:
+        embedding = np.asarray(embedding, dtype=np.float32)
+        self._remember(key, embedding)
+        if self._db is not None:
+            with self._lock:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                    (key, embedding.tobytes()),
+                )
+                self._db.commit()
+
+    def _remember(self, key: str, embedding: np.ndarray) -> None:
+        with self._lock:
+            self._entries[key] = embedding
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_stats(self) -> dict:
+        """Get hit/miss counters and the overall hit rate."""
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+        }
+
+
+def encode_with_cache(model: EmbeddingModel, cache: EmbeddingCache, texts: List[str]) -> List[np.ndarray]:
+    """Encode texts, only running the model for those missing from the cache."""
+    keys = [cache.key(text) for text in texts]
+    embeddings = [cache.get(key) for key in keys]
+
+    missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+    if missing:
+        encoded = model.encode([texts[i] for i in missing])
+        for i, embedding in zip(missing, encoded):
+            cache.put(keys[i], embedding)
+            embeddings[i] = embedding
+
+    return embeddings
+
+
+class EmbeddingBatcher:
+    """Micro-batches concurrent encode requests onto a dedicated thread.
+
+    Requests arriving within `max_wait` seconds of each other are encoded in a
+    single forward pass, off the event loop, so one embedding no longer stalls
+    every other chat on the worker.
+    """
+
+    def __init__(
+        self,
+        model: EmbeddingModel,
+        cache: EmbeddingCache,
+        max_batch_size: int = 32,
+        max_wait: float = 0.005,
+    ):
+        self.model = model
+        self.cache = cache
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="embedding")
+        self._pending: List[Tuple[str, asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._batches: Set[asyncio.Task] = set()
+
+    async def encode(self, text: str) -> np.ndarray:
+        """Encode one text, batched with any concurrent requests."""
+        # Memory-tier hits are answered right away; the disk tier is checked on the executor
+        cached = self.cache.get_memory(self.cache.key(text))
+        if cached is not None:
+            return cached
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((text, future))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.max_wait, self._flush)
+
+        return await future
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.create_task(self._encode_batch(batch))
+            self._batches.add(task)
+            task.add_done_callback(self._batches.discard)
+
+    async def _encode_batch(self, batch: List[Tuple[str, asyncio.Future]]) -> None:
+        texts = [text for text, _ in batch]
+        try:
+            embeddings = await asyncio.get_running_loop().run_in_executor(
+                self._executor, encode_with_cache, self.model, self.cache, texts
+            )
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), embedding in zip(batch, embeddings):
+            if not future.done():
+                future.set_result(embedding)
+
+
 class VectorStore:
-    """A class to handle vector storage operations using Qdrant."""
+    """A class to handle vector storage operations.
+
+    Vectors live in the index selected by VECTOR_STORE_BACKEND: a Qdrant
+    collection, or a flat index kept in-process and persisted under
+    VECTOR_STORE_PATH.
+    """
 
     REQUIRED_ENV_VARS = ["QDRANT_URL", "QDRANT_API_KEY"]
     EMBEDDING_MODEL = "all-MiniLM-L6-v2"
@@ -41,6 +245,8 @@ class VectorStore:
 
     _instance: Optional["VectorStore"] = None
     _initialized: bool = False
+    # Warm-up builds the store on a worker thread while requests may build it on the event loop
+    _init_lock = threading.Lock()
 
     def __new__(cls) -> "VectorStore":
         if cls._instance is None:
@@ -48,14 +254,34 @@ class VectorStore:
         return cls._instance
 
     def __init__(self) -> None:
+        with self._init_lock:
+            self._initialize()
+
+    def _initialize(self) -> None:
         if not self._initialized:
-            self._validate_env_vars()
-            self.model = SentenceTransformer(self.EMBEDDING_MODEL)
-            self.client = QdrantClient(
-                url=clean_env_var(settings.QDRANT_URL), api_key=clean_env_var(settings.QDRANT_API_KEY)
+            self.model = load_embedding_model(self.EMBEDDING_MODEL, settings.EMBEDDING_ENGINE)
+            self.vector_size = self.model.get_sentence_embedding_dimension()
+            self.index = self._create_index()
+            self.embedding_cache = EmbeddingCache(
+                # Quantized engines give slightly different vectors, so they get their own entries
+                f"{self.EMBEDDING_MODEL}/{settings.EMBEDDING_ENGINE}",
+                max_entries=settings.EMBEDDING_CACHE_SIZE,
+                db_path=settings.EMBEDDING_CACHE_DB_PATH,
             )
+            self.embedder = EmbeddingBatcher(self.model, self.embedding_cache)
             self._initialized = True
 
+    def _create_index(self) -> VectorIndex:
+        if settings.VECTOR_STORE_BACKEND == "local":
+            return LocalVectorIndex(settings.VECTOR_STORE_PATH, self.vector_size)
+        self._validate_env_vars()
+        # Imported here so the qdrant client is only loaded when it is used
+        from ai_companion.modules.memory.long_term.qdrant_index import QdrantVectorIndex
+
+        return QdrantVectorIndex(
+            self.COLLECTION_NAME, self.vector_size, settings.EMBEDDING_VECTOR_DTYPE
+        )
+
     def _validate_env_vars(self) -> None:
         """Validate that all required environment variables are set."""
         missing_vars = [var for var in self.REQUIRED_ENV_VARS if not os.getenv(var)]
@@ -64,97 +290,150 @@ class VectorStore:
                 f"Missing required environment variables: {', '.join(missing_vars)}"
             )
 
-    def _collection_exists(self) -> bool:
-        """Check if the memory collection exists."""
-        collections = self.client.get_collections().collections
-        return any(col.name == self.COLLECTION_NAME for col in collections)
-
-    def _create_collection(self) -> None:
-        """Create a new collection for storing memories."""
-        sample_embedding = self.model.encode("sample text")
-        self.client.create_collection(
-            collection_name=self.COLLECTION_NAME,
-            vectors_config=VectorParams(
-                size=len(sample_embedding),
-                distance=Distance.COSINE,
-            ),
-        )
+    def _encode(self, text: str) -> np.ndarray:
+        """Encode one text on the calling thread, going through the embedding cache."""
+        return encode_with_cache(self.model, self.embedding_cache, [text])[0]
 
-    def find_similar_memory(self, text: str) -> Optional[Memory]:
-        """Find if a similar memory already exists.
+    def ensure_collection(self) -> None:
+        """Create (or load) the memory index. Only does work until it succeeds once."""
+        self.index.ensure_collection()
+
+    async def aensure_collection(self) -> None:
+        """Async version of `ensure_collection`."""
+        await self.index.aensure_collection()
+
+    @staticmethod
+    def _to_memories(hits: List[IndexHit]) -> List[Memory]:
+        return [
+            Memory(
+                text=hit.payload["text"],
+                metadata={k: v for k, v in hit.payload.items() if k != "text"},
+                score=hit.score,
+            )
+            for hit in hits
+        ]
+
+    @staticmethod
+    def _build_point(
+        text: str, metadata: dict, user_id: str, similar: List[IndexHit]
+    ) -> Tuple[str, dict, UpsertResult]:
+        """Build the point ID and payload, reusing the ID of a similar memory if one was found."""
+        if similar:
+            point_id = similar[0].id  # Keep same ID for update
+        else:
+            point_id = str(metadata.get("id") or uuid.uuid4())
+
+        payload = {
+            "text": text,
+            **metadata,
+            USER_ID_FIELD: user_id,
+            "id": point_id,
+        }
+        return point_id, payload, UpsertResult(id=point_id, inserted=not similar)
+
+    def find_similar_memory(self, text: str, user_id: str) -> Optional[Memory]:
+        """Find if a similar memory already exists for a user.
 
         Args:
             text: The text to search for
+            user_id: The user whose memories are searched
 
         Returns:
             Optional Memory if a similar one is found
         """
-        results = self.search_memories(text, k=1)
+        results = self.search_memories(text, user_id, k=1)
         if results and results[0].score >= self.SIMILARITY_THRESHOLD:
             return results[0]
         return None
 
-    def store_memory(self, text: str, metadata: dict) -> None:
+    def store_memory(self, text: str, metadata: dict, user_id: str) -> None:
         """Store a new memory in the vector store or update if similar exists.
 
         Args:
             text: The text content of the memory
             metadata: Additional information about the memory (timestamp, type, etc.)
+            user_id: The user the memory belongs to
         """
-        if not self._collection_exists():
-            self._create_collection()
-
-        # Check if similar memory exists
-        similar_memory = self.find_similar_memory(text)
-        if similar_memory and similar_memory.id:
-            metadata["id"] = similar_memory.id  # Keep same ID for update
-
-        embedding = self.model.encode(text)
-        point = PointStruct(
-            id=metadata.get("id", hash(text)),
-            vector=embedding.tolist(),
-            payload={
-                "text": text,
-                **metadata,
-            },
-        )
+        self.upsert_memory(text, metadata, user_id)
 
-        self.client.upsert(
-            collection_name=self.COLLECTION_NAME,
-            points=[point],
+    def upsert_memory(self, text: str, metadata: dict, user_id: str) -> UpsertResult:
+        """Insert a memory, or merge it into an existing similar one, in a single pass.
+
+        The text is embedded once and that vector is used both for the
+        similarity search and for the upsert. Only the user's own memories are
+        considered for merging.
+
+        Args:
+            text: The text content of the memory
+            metadata: Additional information about the memory (timestamp, type, etc.)
+            user_id: The user the memory belongs to
+
+        Returns:
+            UpsertResult with the point ID and whether a new memory was inserted
+        """
+        embedding = self._encode(text).tolist()
+        similar = self.index.search(
+            embedding, user_id, limit=1, score_threshold=self.SIMILARITY_THRESHOLD
         )
 
-    def search_memories(self, query: str, k: int = 5) -> List[Memory]:
-        """Search for similar memories in the vector store.
+        point_id, payload, result = self._build_point(text, metadata, user_id, similar)
+        self.index.upsert(point_id, embedding, payload)
+        return result
+
+    def search_memories(self, query: str, user_id: str, k: int = 5) -> List[Memory]:
+        """Search for similar memories of one user in the vector store.
 
         Args:
             query: Text to search for
+            user_id: The user whose memories are searched
             k: Number of results to return
 
         Returns:
             List of Memory objects
         """
-        if not self._collection_exists():
-            return []
-
-        query_embedding = self.model.encode(query)
-        results = self.client.search(
-            collection_name=self.COLLECTION_NAME,
-            query_vector=query_embedding.tolist(),
-            limit=k,
+        query_embedding = self._encode(query)
+        hits = self.index.search(query_embedding.tolist(), user_id, limit=k)
+        return self._to_memories(hits)
+
+    async def afind_similar_memory(self, text: str, user_id: str) -> Optional[Memory]:
+        """Async version of `find_similar_memory`."""
+        results = await self.asearch_memories(text, user_id, k=1)
+        if results and results[0].score >= self.SIMILARITY_THRESHOLD:
+            return results[0]
+        return None
+
+    async def astore_memory(self, text: str, metadata: dict, user_id: str) -> None:
+        """Async version of `store_memory`."""
+        await self.aupsert_memory(text, metadata, user_id)
+
+    async def aupsert_memory(self, text: str, metadata: dict, user_id: str) -> UpsertResult:
+        """Async version of `upsert_memory`."""
+        embedding = (await self.embedder.encode(text)).tolist()
+        similar = await self.index.asearch(
+            embedding, user_id, limit=1, score_threshold=self.SIMILARITY_THRESHOLD
         )
 
-        return [
-            Memory(
-                text=hit.payload["text"],
-                metadata={k: v for k, v in hit.payload.items() if k != "text"},
-                score=hit.score,
-            )
-            for hit in results
-        ]
+        point_id, payload, result = self._build_point(text, metadata, user_id, similar)
+        await self.index.aupsert(point_id, embedding, payload)
+        return result
+
+    async def asearch_memories(self, query: str, user_id: str, k: int = 5) -> List[Memory]:
+        """Async version of `search_memories`.
+
+        Embedding runs on the batcher's thread and the index is queried
+        asynchronously, so the event loop is never blocked.
+        """
+        query_embedding = await self.embedder.encode(query)
+        hits = await self.index.asearch(query_embedding.tolist(), user_id, limit=k)
+        return self._to_memories(hits)
 
 
 @lru_cache
 def get_vector_store() -> VectorStore:
     """Get or create the VectorStore singleton instance."""
     return VectorStore()
+
+
+def is_vector_store_loaded() -> bool:
+    """Check whether the VectorStore has been created, without creating it."""
+    return get_vector_store.cache_info().currsize > 0
@@ -0,0 +1,176 @@
+import asyncio
+import logging
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, List, Optional, Set
+
+from langchain_core.messages import BaseMessage, HumanMessage, RemoveMessage
+from langchain_core.messages.utils import count_tokens_approximately
+
+from ai_companion.graph.edges import select_workflow
+from ai_companion.settings import settings
+
+if TYPE_CHECKING:
+    from ai_companion.interfaces.api.runtime import GraphRuntime
+
+
+@dataclass
+class SummarizationStats:
+    """Counters for the background conversation summarizer."""
+
+    scheduled: int = 0
+    coalesced: int = 0  # Requests merged into a summarization already running for the thread
+    summarized: int = 0
+    messages_folded: int = 0
+    stale: int = 0  # Summaries discarded because the thread changed underneath them
+    failed: int = 0
+
+
+class ConversationSummarizer:
+    """Keeps each conversation's short-term memory within a token budget.
+
+    Runs after a reply has been delivered, off the request path. Once a
+    thread's messages exceed `trigger_tokens`, the oldest ones are folded into
+    the running summary, keeping the most recent `keep_tokens` worth of
+    messages verbatim. Only the messages being removed are sent to the model
+    along with the previous summary, so the cost of a summarization does not
+    grow with the length of the conversation.
+    """
+
+    def __init__(self, trigger_tokens: int, keep_tokens: int):
+        self.trigger_tokens = trigger_tokens
+        self.keep_tokens = keep_tokens
+        self.stats = SummarizationStats()
+        self.logger = logging.getLogger(__name__)
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._rerun: Set[str] = set()
+
+    def schedule(self, runtime: "GraphRuntime", thread_id: str) -> None:
+        """Summarize a thread in the background if it has grown past the budget.
+
+        Args:
+            runtime: The graph runtime holding the thread's checkpointer
+            thread_id: The conversation thread to check
+        """
+        self.stats.scheduled += 1
+        if thread_id in self._tasks:
+            # Re-check once the running summarization is done
+            self.stats.coalesced += 1
+            self._rerun.add(thread_id)
+            return
+
+        self._tasks[thread_id] = asyncio.create_task(
+            self._run(runtime, thread_id), name=f"summarize-{thread_id}"
+        )
+
+    async def _run(self, runtime: "GraphRuntime", thread_id: str) -> None:
+        try:
+            while True:
+                self._rerun.discard(thread_id)
+                try:
+                    await self.summarize(runtime, thread_id)
+                except Exception as e:
+                    self.stats.failed += 1
+                    self.logger.error(f"Summarizing thread {thread_id} failed: {str(e)}")
+                if thread_id not in self._rerun:
+                    break
+        finally:
+            del self._tasks[thread_id]
+
+    def messages_to_fold(self, messages: List[BaseMessage]) -> List[BaseMessage]:
+        """Select the oldest messages to fold into the summary, if over the trigger budget."""
+        if count_tokens_approximately(messages) <= self.trigger_tokens:
+            return []
+
+        # Keep the newest messages that fit in the budget, and always the last one
+        keep_from = len(messages) - 1
+        kept_tokens = count_tokens_approximately(messages[keep_from:])
+        while keep_from > 0:
+            tokens = count_tokens_approximately([messages[keep_from - 1]])
+            if kept_tokens + tokens > self.keep_tokens:
+                break
+            kept_tokens += tokens
+            keep_from -= 1
+        return messages[:keep_from]
+
+    async def summarize(self, runtime: "GraphRuntime", thread_id: str) -> bool:
+        """Fold a thread's oldest messages into its summary if it is over budget.
+
+        Returns:
+            bool: True if the thread's state was updated
+        """
+        config = {"configurable": {"thread_id": thread_id}}
+        state = (await runtime.graph.aget_state(config)).values
+        fold = self.messages_to_fold(state.get("messages", []))
+        if not fold:
+            return False
+
+        summary = state.get("summary", "")
+        new_summary = await self._extend_summary(summary, fold)
+
+        # The model call runs unlocked; the update is only applied if no run has
+        # changed the folded messages or the summary in the meantime
+        async with runtime.thread_lock(thread_id):
+            current = (await runtime.graph.aget_state(config)).values
+            current_ids = {m.id for m in current.get("messages", [])}
+            if current.get("summary", "") != summary or any(m.id not in current_ids for m in fold):
+                self.stats.stale += 1
+                return False
+
+            await runtime.graph.aupdate_state(
+                config,
+                {"summary": new_summary, "messages": [RemoveMessage(id=m.id) for m in fold]},
+                # Recorded as the response node that ended the turn, which leads to END
+                as_node=select_workflow(current),
+            )
+
+        self.stats.summarized += 1
+        self.stats.messages_folded += len(fold)
+        return True
+
+    async def _extend_summary(self, summary: str, messages: List[BaseMessage]) -> str:
+        # Imported here so loading the summarizer doesn't import the model SDK
+        from ai_companion.graph.utils.helpers import get_chain_model
+
+        if summary:
+            summary_message = (
+                f"This is summary of the conversation to date between Ava and the user: {summary}\n\n"
+                "Extend the summary by taking into account the new messages above:"
+            )
+        else:
+            summary_message = (
+                "Create a summary of the conversation above between Ava and the user. "
+                "The summary must be a short description of the conversation so far, "
+                "but that captures all the relevant information shared between Ava and the user:"
+            )
+
+        response = await get_chain_model("summarizer").ainvoke(
+            messages + [HumanMessage(content=summary_message)]
+        )
+        return response.content
+
+    async def stop(self, timeout: Optional[float] = None) -> None:
+        """Wait for running summarizations to finish, then cancel any left over."""
+        tasks = list(self._tasks.values())
+        if not tasks:
+            return
+
+        _, pending = await asyncio.wait(tasks, timeout=timeout)
+        if pending:
+            self.logger.warning(f"Cancelling {len(pending)} unfinished summarization(s)")
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    def get_stats(self) -> dict:
+        """Get the summarizer counters and the number of summarizations running."""
+        return {**asdict(self.stats), "running": len(self._tasks)}
+
+
+@lru_cache
+def get_conversation_summarizer() -> ConversationSummarizer:
+    """Get or create the ConversationSummarizer singleton instance."""
+    return ConversationSummarizer(
+        trigger_tokens=settings.SUMMARY_TRIGGER_TOKENS,
+        keep_tokens=settings.SUMMARY_KEEP_TOKENS,
+    )
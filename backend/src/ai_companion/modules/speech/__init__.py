@@ -1,4 +1,4 @@
 from .speech_to_text import SpeechToText
-from .text_to_speech import TextToSpeech
+from .text_to_speech import SentenceSplitter, SpeechStream, TextToSpeech
 
-__all__ = ["SpeechToText", "TextToSpeech"]
+__all__ = ["SentenceSplitter", "SpeechStream", "SpeechToText", "TextToSpeech"]
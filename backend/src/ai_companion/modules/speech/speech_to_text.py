@@ -1,13 +1,96 @@
+import asyncio
+import io
 import os
-import tempfile
-from typing import Optional
+import struct
+import wave
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, AsyncIterable, List, Optional, Tuple
 
-from groq import Groq
+import numpy as np
 
 from ai_companion.core.exceptions import SpeechToTextError
 from ai_companion.settings import settings
 from ai_companion.core.helpers import clean_env_var
 
+if TYPE_CHECKING:
+    from groq import AsyncGroq
+
+
+@dataclass(frozen=True)
+class _PcmFormat:
+    channels: int
+    sample_rate: int
+    sample_width: int  # Bytes per sample
+
+    @property
+    def frame_size(self) -> int:
+        return self.channels * self.sample_width
+
+
+def _parse_wav_header(data: bytes) -> Optional[Tuple[Optional[_PcmFormat], int]]:
+    """Find the sample format and start of the samples in the beginning of a WAV file.
+
+    Returns:
+        None if more bytes are needed, otherwise the format (None if the data is
+        not uncompressed PCM WAV) and the offset of the first sample
+    """
+    if len(data) < 12:
+        return None
+    if data[:4] != b"RIFF" or data[8:12] != b"WAVE":
+        return None, 0
+
+    pcm_format = None
+    offset = 12
+    while len(data) >= offset + 8:
+        chunk_id, chunk_size = data[offset : offset + 4], struct.unpack_from("<I", data, offset + 4)[0]
+        if chunk_id == b"data":
+            return pcm_format, offset + 8
+        if chunk_id == b"fmt ":
+            if len(data) < offset + 24:
+                return None
+            audio_format, channels, sample_rate, _, _, bits = struct.unpack_from("<HHIIHH", data, offset + 8)
+            if audio_format == 1 and bits % 8 == 0:
+                pcm_format = _PcmFormat(channels, sample_rate, bits // 8)
+        offset += 8 + chunk_size + (chunk_size & 1)
+    return None
+
+
+# Sample widths whose loudness can be measured; 8-bit WAV is unsigned, centered on 128
+_SAMPLE_DTYPES = {1: np.uint8, 2: np.dtype("<i2"), 4: np.dtype("<i4")}
+
+
+def _quietest_frame(pcm_format: _PcmFormat, samples: bytes, window_frames: int) -> Optional[int]:
+    """Find the middle of the quietest window in a stretch of samples.
+
+    Returns:
+        The frame offset of the quietest point, or None if the sample width
+        is not supported or the samples are shorter than one window
+    """
+    dtype = _SAMPLE_DTYPES.get(pcm_format.sample_width)
+    windows = len(samples) // (window_frames * pcm_format.frame_size)
+    if dtype is None or windows == 0:
+        return None
+
+    values = np.frombuffer(
+        samples, dtype=dtype, count=windows * window_frames * pcm_format.channels
+    ).astype(np.float64)
+    if pcm_format.sample_width == 1:
+        values -= 128
+    energy = np.square(values).reshape(windows, -1).mean(axis=1)
+    # The latest of equally quiet windows, to keep segments as long as possible
+    quietest = windows - 1 - int(np.argmin(energy[::-1]))
+    return quietest * window_frames + window_frames // 2
+
+
+def _to_wav(pcm_format: _PcmFormat, samples: bytes) -> bytes:
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(pcm_format.channels)
+        wav.setsampwidth(pcm_format.sample_width)
+        wav.setframerate(pcm_format.sample_rate)
+        wav.writeframes(samples)
+    return buffer.getvalue()
+
 
 class SpeechToText:
     """A class to handle speech-to-text conversion using Groq's Whisper model."""
@@ -15,10 +98,17 @@ class SpeechToText:
     # Required environment variables
     REQUIRED_ENV_VARS = ["GROQ_API_KEY"]
 
+    # Segments of one recording transcribed at the same time
+    MAX_CONCURRENT_SEGMENTS = 4
+    # A segment is cut at the quietest CUT_WINDOW_SECONDS within its last CUT_SEARCH_SECONDS,
+    # so the cut falls between words rather than through one
+    CUT_SEARCH_SECONDS = 3.0
+    CUT_WINDOW_SECONDS = 0.02
+
     def __init__(self):
         """Initialize the SpeechToText class and validate environment variables."""
         self._validate_env_vars()
-        self._client: Optional[Groq] = None
+        self._client: Optional["AsyncGroq"] = None
 
     def _validate_env_vars(self) -> None:
         """Validate that all required environment variables are set."""
@@ -29,54 +119,140 @@ class SpeechToText:
             )
 
     @property
-    def client(self) -> Groq:
-        """Get or create Groq client instance using singleton pattern."""
+    def client(self) -> "AsyncGroq":
+        """Get or create AsyncGroq client instance using singleton pattern."""
         if self._client is None:
-            self._client = Groq(api_key=clean_env_var(settings.GROQ_API_KEY))
+            from groq import AsyncGroq
+
+            self._client = AsyncGroq(api_key=clean_env_var(settings.GROQ_API_KEY))
         return self._client
 
-    async def transcribe(self, audio_data: bytes) -> str:
+    async def transcribe(self, audio_data: bytes, filename: str = "audio.wav") -> str:
         """Convert speech to text using Groq's Whisper model.
 
         Args:
             audio_data: Binary audio data
+            filename: Name of the uploaded file; its extension tells the API the audio format
 
         Returns:
             str: Transcribed text
 
         Raises:
             ValueError: If the audio file is empty or invalid
-            RuntimeError: If the transcription fails
+            SpeechToTextError: If the transcription fails
         """
         if not audio_data:
             raise ValueError("Audio data cannot be empty")
 
         try:
-            # Create a temporary file with .wav extension
-            with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as temp_file:
-                temp_file.write(audio_data)
-                temp_file_path = temp_file.name
-
-            try:
-                # Open the temporary file for the API request
-                with open(temp_file_path, "rb") as audio_file:
-                    transcription = self.client.audio.transcriptions.create(
-                        file=audio_file,
-                        model="whisper-large-v3-turbo",
-                        language="en",
-                        response_format="text",
-                    )
-
-                if not transcription:
-                    raise SpeechToTextError("Transcription result is empty")
-
-                return transcription
+            transcription = await self._create_transcription(filename, audio_data)
+            if not transcription:
+                raise SpeechToTextError("Transcription result is empty")
 
-            finally:
-                # Clean up the temporary file
-                os.unlink(temp_file_path)
+            return transcription
 
         except Exception as e:
             raise SpeechToTextError(
                 f"Speech-to-text conversion failed: {str(e)}"
             ) from e
+
+    async def _create_transcription(self, filename: str, audio_data: bytes) -> str:
+        # Uploaded straight from memory, no temporary file
+        return await self.client.audio.transcriptions.create(
+            file=(filename, audio_data),
+            model=settings.STT_MODEL_NAME,
+            language="en",
+            response_format="text",
+        )
+
+    async def transcribe_stream(
+        self, chunks: AsyncIterable[bytes], filename: str = "audio.wav"
+    ) -> str:
+        """Transcribe a recording in segments that are transcribed in parallel.
+
+        Uncompressed PCM WAV is cut into segments of up to
+        `STT_SEGMENT_SECONDS`, each ending at the quietest moment of its last
+        `CUT_SEARCH_SECONDS`, which is normally a pause between words. A
+        segment is sent for transcription as soon as its audio has been read,
+        so with a live source the transcription overlaps with receiving the
+        rest. Other formats can't be cut without decoding them, so they are
+        collected and transcribed in one request, as are recordings shorter
+        than one segment.
+
+        Args:
+            chunks: The audio file, in arbitrarily sized pieces
+            filename: Name of the uploaded file; its extension tells the API the audio format
+
+        Returns:
+            str: Transcribed text
+
+        Raises:
+            ValueError: If the audio is empty
+            SpeechToTextError: If the transcription of any segment fails
+        """
+        semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_SEGMENTS)
+        segments: List[asyncio.Task] = []
+
+        async def transcribe_segment(pcm_format: _PcmFormat, samples: bytes) -> str:
+            # A silent segment transcribes to nothing, which is only an error for the whole recording
+            async with semaphore:
+                return await self._create_transcription("segment.wav", _to_wav(pcm_format, samples))
+
+        buffer = bytearray()
+        header: Optional[Tuple[Optional[_PcmFormat], int]] = None
+        segment_size = search_size = window_frames = 0
+        try:
+            async for chunk in chunks:
+                buffer += chunk
+                if header is None:
+                    header = _parse_wav_header(bytes(buffer))
+                    if header is None or header[0] is None:
+                        continue
+                    pcm_format, data_offset = header
+                    del buffer[:data_offset]
+                    frames = max(1, int(pcm_format.sample_rate * settings.STT_SEGMENT_SECONDS))
+                    segment_size = frames * pcm_format.frame_size
+                    search_frames = min(
+                        frames // 2, int(pcm_format.sample_rate * self.CUT_SEARCH_SECONDS)
+                    )
+                    search_size = search_frames * pcm_format.frame_size
+                    window_frames = max(1, int(pcm_format.sample_rate * self.CUT_WINDOW_SECONDS))
+                if header[0] is None:
+                    continue
+
+                while len(buffer) >= segment_size:
+                    search_start = segment_size - search_size
+                    quietest = _quietest_frame(
+                        header[0], bytes(buffer[search_start:segment_size]), window_frames
+                    )
+                    cut = segment_size
+                    if quietest is not None:
+                        cut = search_start + quietest * header[0].frame_size
+                    segments.append(
+                        asyncio.create_task(transcribe_segment(header[0], bytes(buffer[:cut])))
+                    )
+                    del buffer[:cut]
+
+            if header is None or header[0] is None:
+                return await self.transcribe(bytes(buffer), filename)
+
+            # The remainder is the last (or only) segment; drop a trailing partial frame
+            remainder = len(buffer) - len(buffer) % header[0].frame_size
+            if remainder:
+                segments.append(
+                    asyncio.create_task(transcribe_segment(header[0], bytes(buffer[:remainder])))
+                )
+            if not segments:
+                raise ValueError("Audio data cannot be empty")
+            texts = await asyncio.gather(*segments)
+        except BaseException as e:
+            for segment in segments:
+                segment.cancel()
+            if isinstance(e, (ValueError, SpeechToTextError)) or not isinstance(e, Exception):
+                raise
+            raise SpeechToTextError(f"Speech-to-text conversion failed: {str(e)}") from e
+
+        transcription = " ".join(text.strip() for text in texts if text.strip())
+        if not transcription:
+            raise SpeechToTextError("Transcription result is empty")
+        return transcription
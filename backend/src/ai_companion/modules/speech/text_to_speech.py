@@ -1,11 +1,16 @@
+import asyncio
 import os
-from elevenlabs import ElevenLabs, Voice, VoiceSettings
-from typing import Optional
+import re
+from typing import TYPE_CHECKING, AsyncIterator, List, Optional, Union
 
 from ai_companion.core.exceptions import TextToSpeechError
+from ai_companion.modules.speech.tts_cache import get_tts_cache
 from ai_companion.settings import settings
 from ai_companion.core.helpers import clean_env_var
 
+if TYPE_CHECKING:
+    from elevenlabs import AsyncElevenLabs
+
 
 class TextToSpeech:
     """A class to handle text-to-speech conversion using ElevenLabs."""
@@ -13,10 +18,13 @@ class TextToSpeech:
     # Required environment variables
     REQUIRED_ENV_VARS = ["ELEVENLABS_API_KEY", "ELEVENLABS_VOICE_ID"]
 
+    OUTPUT_FORMAT = "mp3_44100_128"
+
     def __init__(self):
         """Initialize the TextToSpeech class and validate environment variables."""
         self._validate_env_vars()
-        self._client: Optional[ElevenLabs] = None
+        self._client: Optional["AsyncElevenLabs"] = None
+        self.cache = get_tts_cache()
 
     def _validate_env_vars(self) -> None:
         """Validate that all required environment variables are set."""
@@ -27,10 +35,12 @@ class TextToSpeech:
             )
 
     @property
-    def client(self) -> ElevenLabs:
-        """Get or create ElevenLabs client instance using singleton pattern."""
+    def client(self) -> "AsyncElevenLabs":
+        """Get or create AsyncElevenLabs client instance using singleton pattern."""
         if self._client is None:
-            self._client = ElevenLabs(api_key=clean_env_var(settings.ELEVENLABS_API_KEY))
+            from elevenlabs import AsyncElevenLabs
+
+            self._client = AsyncElevenLabs(api_key=clean_env_var(settings.ELEVENLABS_API_KEY))
         return self._client
 
     async def synthesize(self, text: str) -> bytes:
@@ -42,6 +52,28 @@ class TextToSpeech:
         Returns:
             bytes: Audio data
 
+        Raises:
+            ValueError: If the input text is empty or too long
+            TextToSpeechError: If the text-to-speech conversion fails
+        """
+        audio_bytes = b"".join([chunk async for chunk in self.stream(text)])
+        if not audio_bytes:
+            raise TextToSpeechError("Generated audio is empty")
+
+        return audio_bytes
+
+    async def stream(self, text: str, previous_text: Optional[str] = None) -> AsyncIterator[bytes]:
+        """Convert text to speech, yielding MP3 chunks as ElevenLabs produces them.
+
+        Args:
+            text: Text to convert to speech
+            previous_text: The text spoken right before, so a sentence synthesized on
+                its own keeps the intonation of the passage it belongs to. Not part of
+                the cache key: a cached utterance is reused whatever preceded it
+
+        Yields:
+            bytes: Consecutive pieces of one MP3 stream
+
         Raises:
             ValueError: If the input text is empty or too long
             TextToSpeechError: If the text-to-speech conversion fails
@@ -52,22 +84,144 @@ class TextToSpeech:
         if len(text) > 5000:  # ElevenLabs typical limit
             raise ValueError("Input text exceeds maximum length of 5000 characters")
 
+        voice_id = clean_env_var(settings.ELEVENLABS_VOICE_ID)
+        # Short utterances recur (greetings, confirmations); a cached one is served as a single chunk
+        cache_key = None
+        if self.cache is not None and len(text) <= settings.TTS_CACHE_MAX_TEXT_LENGTH:
+            cache_key = self.cache.key(voice_id, settings.TTS_MODEL_NAME, self.OUTPUT_FORMAT, text)
+            cached = await self.cache.get(cache_key)
+            if cached:
+                yield cached
+                return
+
+        chunks = []
         try:
-            audio_generator = self.client.text_to_speech.convert(
+            async for chunk in self.client.text_to_speech.stream(
+                voice_id=voice_id,
                 text=text,
-                voice_id=clean_env_var(settings.ELEVENLABS_VOICE_ID),
                 model_id=settings.TTS_MODEL_NAME,
-                output_format="mp3_44100_128",
-            )
-
-            # Convert generator to bytes
-            audio_bytes = b"".join(audio_generator)
-            if not audio_bytes:
-                raise TextToSpeechError("Generated audio is empty")
-
-            return audio_bytes
+                output_format=self.OUTPUT_FORMAT,
+                **({"previous_text": previous_text} if previous_text else {}),
+            ):
+                chunks.append(chunk)
+                yield chunk
 
         except Exception as e:
             raise TextToSpeechError(
                 f"Text-to-speech conversion failed: {str(e)}"
             ) from e
+
+        if cache_key is not None and chunks:
+            await self.cache.put(cache_key, b"".join(chunks))
+
+
+class SentenceSplitter:
+    """Cuts streamed text into sentences as soon as each one is complete.
+
+    A sentence ends at terminal punctuation followed by whitespace, or at a
+    line break. Fragments shorter than `min_length` are joined with the next
+    sentence, so interjections like "Oh!" don't cost a synthesis request of
+    their own.
+    """
+
+    BOUNDARY = re.compile(r"[.!?…]+[\"'”’)\]]*\s+|\n+")
+
+    def __init__(self, min_length: int = 20):
+        self.min_length = min_length
+        self._buffer = ""
+
+    def feed(self, text: str) -> List[str]:
+        """Add streamed text and return the sentences it completed."""
+        self._buffer += text
+        sentences = []
+        start = 0
+        for match in self.BOUNDARY.finditer(self._buffer):
+            sentence = self._buffer[start : match.end()].strip()
+            if len(sentence) >= self.min_length:
+                sentences.append(sentence)
+                start = match.end()
+        self._buffer = self._buffer[start:]
+        return sentences
+
+    def flush(self) -> Optional[str]:
+        """Return the text after the last complete sentence, once the stream has ended."""
+        rest, self._buffer = self._buffer.strip(), ""
+        return rest or None
+
+
+class SpeechStream:
+    """Speaks a response while it is being generated.
+
+    Text is fed in as the model streams it. Every completed sentence is
+    synthesized right away, one after the other, while generation carries on,
+    and the MP3 chunks are made available in order as they arrive. The whole
+    recording is kept so it can be stored once the response is done.
+    """
+
+    def __init__(self, text_to_speech: TextToSpeech):
+        self.text_to_speech = text_to_speech
+        self._splitter = SentenceSplitter()
+        self._sentences: asyncio.Queue[Optional[str]] = asyncio.Queue()
+        self._chunks: asyncio.Queue[Union[bytes, Exception, None]] = asyncio.Queue()
+        self._audio = bytearray()
+        self._task = asyncio.create_task(self._synthesize())
+
+    @property
+    def audio(self) -> bytes:
+        """The audio synthesized so far, as one MP3 stream."""
+        return bytes(self._audio)
+
+    def feed(self, text: str) -> None:
+        """Add streamed response text."""
+        for sentence in self._splitter.feed(text):
+            self._sentences.put_nowait(sentence)
+
+    def close(self) -> None:
+        """Mark the end of the response, so its last sentence gets synthesized."""
+        rest = self._splitter.flush()
+        if rest:
+            self._sentences.put_nowait(rest)
+        self._sentences.put_nowait(None)
+
+    def cancel(self) -> None:
+        """Stop synthesizing, e.g. because the client went away."""
+        self._task.cancel()
+
+    async def _synthesize(self) -> None:
+        previous = None
+        try:
+            while (sentence := await self._sentences.get()) is not None:
+                async for chunk in self.text_to_speech.stream(sentence, previous_text=previous):
+                    self._audio += chunk
+                    self._chunks.put_nowait(chunk)
+                previous = sentence
+        except Exception as e:
+            self._chunks.put_nowait(e)
+        finally:
+            self._chunks.put_nowait(None)
+
+    def _unwrap(self, item: Union[bytes, Exception]) -> bytes:
+        if isinstance(item, Exception):
+            raise item
+        return item
+
+    def ready(self) -> List[bytes]:
+        """Take the chunks that have arrived so far, without waiting."""
+        chunks = []
+        while not self._chunks.empty():
+            item = self._chunks.get_nowait()
+            if item is None:
+                # Keep the end marker for `remaining`
+                self._chunks.put_nowait(None)
+                break
+            chunks.append(self._unwrap(item))
+        return chunks
+
+    async def remaining(self) -> AsyncIterator[bytes]:
+        """Yield the rest of the chunks as they arrive, after `close`.
+
+        Raises:
+            TextToSpeechError: If synthesizing any sentence failed
+        """
+        while (item := await self._chunks.get()) is not None:
+            yield self._unwrap(item)
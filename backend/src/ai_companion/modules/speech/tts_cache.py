@@ -0,0 +1,172 @@
+import asyncio
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+import unicodedata
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+from ai_companion.settings import settings
+
+
+@dataclass
+class TTSCacheStats:
+    """Counters for the synthesized speech cache."""
+
+    hits: int = 0
+    misses: int = 0
+    writes: int = 0
+    evictions: int = 0
+    errors: int = 0
+
+
+class TTSCache:
+    """Size-bounded, content-addressed cache of synthesized speech on local disk.
+
+    Entries are keyed by the SHA-256 of voice, model, output format and
+    normalized text, and stored as one file each under `root`, so every worker
+    on the host shares them. Reads refresh a file's modification time, which
+    makes eviction least-recently-used across workers: when the directory
+    grows past `max_bytes`, the oldest files are deleted until it is back
+    under 90% of the limit. The cache is best effort; disk errors are logged
+    and counted, never raised.
+    """
+
+    # Re-measure the directory after this many writes, to account for other workers
+    RESCAN_INTERVAL = 100
+
+    def __init__(self, root: str, max_bytes: int):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.stats = TTSCacheStats()
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._size: Optional[int] = None  # Estimated bytes on disk, measured on first write
+        self._writes_since_scan = 0
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """Normalize text so trivially different inputs share an entry.
+
+        Case is kept, since it can change how abbreviations are spoken.
+        """
+        return " ".join(unicodedata.normalize("NFKC", text).split())
+
+    def key(self, voice_id: str, model_id: str, output_format: str, text: str) -> str:
+        return hashlib.sha256(
+            "\0".join([voice_id, model_id, output_format, self.normalize(text)]).encode("utf-8")
+        ).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], key)
+
+    def _read(self, key: str) -> Optional[bytes]:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                audio = f.read()
+            os.utime(path)
+            return audio
+        except FileNotFoundError:
+            # Also raised by utime when another worker evicts the file in between
+            return None
+
+    def _write(self, key: str, audio: bytes) -> None:
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write to a temporary file first so readers never see a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(audio)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+        with self._lock:
+            self._writes_since_scan += 1
+            if self._size is None or self._writes_since_scan >= self.RESCAN_INTERVAL:
+                self._size = self._scan_size()
+                self._writes_since_scan = 0
+            else:
+                self._size += len(audio)
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _entries(self) -> List[Tuple[float, int, str]]:
+        """List the cached files as (mtime, size, path)."""
+        entries = []
+        for shard in os.scandir(self.root):
+            if shard.is_dir():
+                for entry in os.scandir(shard.path):
+                    if not entry.is_file() or entry.name.startswith("tmp"):
+                        continue
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue  # Evicted by another worker during the scan
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    def _scan_size(self) -> int:
+        return sum(entry_size for _, entry_size, _ in self._entries())
+
+    def _evict(self) -> None:
+        entries = sorted(self._entries())
+        size = sum(entry_size for _, entry_size, _ in entries)
+        target = int(self.max_bytes * 0.9)
+        for _, entry_size, path in entries:
+            if size <= target:
+                break
+            try:
+                os.unlink(path)
+                self.stats.evictions += 1
+            except FileNotFoundError:
+                pass  # Evicted by another worker
+            size -= entry_size
+        self._size = size
+
+    async def get(self, key: str) -> Optional[bytes]:
+        """Look up synthesized audio, or None on a miss."""
+        try:
+            audio = await asyncio.to_thread(self._read, key)
+        except OSError as e:
+            self.stats.errors += 1
+            self.logger.warning(f"Reading the TTS cache failed: {str(e)}")
+            audio = None
+
+        if audio is None:
+            self.stats.misses += 1
+        else:
+            self.stats.hits += 1
+        return audio
+
+    async def put(self, key: str, audio: bytes) -> None:
+        """Store synthesized audio, evicting old entries if the cache is full."""
+        try:
+            await asyncio.to_thread(self._write, key, audio)
+            self.stats.writes += 1
+        except OSError as e:
+            self.stats.errors += 1
+            self.logger.warning(f"Writing the TTS cache failed: {str(e)}")
+
+    def get_stats(self) -> dict:
+        """Get the cache counters, hit rate and estimated size on disk."""
+        lookups = self.stats.hits + self.stats.misses
+        return {
+            **asdict(self.stats),
+            "hit_rate": round(self.stats.hits / lookups, 4) if lookups else 0.0,
+            "bytes": self._size,
+        }
+
+
+@lru_cache
+def get_tts_cache() -> Optional[TTSCache]:
+    """Get the TTSCache singleton instance, or None if the cache is disabled."""
+    if not settings.TTS_CACHE_PATH:
+        return None
+    return TTSCache(settings.TTS_CACHE_PATH, settings.TTS_CACHE_MAX_BYTES)
@@ -1,3 +1,5 @@
+from typing import Dict, Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -14,24 +16,98 @@ class Settings(BaseSettings):
     ELEVENLABS_VOICE_ID: str
     TOGETHER_API_KEY: str
 
-    QDRANT_API_KEY: str | None
-    QDRANT_URL: str
+    QDRANT_API_KEY: str | None = None
+    QDRANT_URL: str | None = None
     QDRANT_PORT: str = "6333"
     QDRANT_HOST: str | None = None
 
     TEXT_MODEL_NAME: str = "llama-3.3-70b-versatile"
     SMALL_TEXT_MODEL_NAME: str = "llama-3.1-8b-instant"
+
+    # Model tiers: "large" runs TEXT_MODEL_NAME and "small" SMALL_TEXT_MODEL_NAME, each with
+    # its own per-request timeout (seconds) and cap on concurrent requests per worker
+    LARGE_MODEL_TIMEOUT: float = 60.0
+    LARGE_MODEL_MAX_CONCURRENCY: int = 8
+    SMALL_MODEL_TIMEOUT: float = 15.0
+    SMALL_MODEL_MAX_CONCURRENCY: int = 16
+    # Tier each chain runs on; chains not listed use "large"
+    CHAIN_MODEL_TIERS: Dict[str, Literal["large", "small"]] = {
+        "router": "small",
+        "memory_analysis": "small",
+        "summarizer": "large",
+        "scenario": "large",
+        "prompt_enhancer": "large",
+        "character_response": "large",
+    }
     STT_MODEL_NAME: str = "whisper-large-v3-turbo"
     TTS_MODEL_NAME: str = "eleven_flash_v2_5"
     TTI_MODEL_NAME: str = "black-forest-labs/FLUX.1-schnell-Free"
     ITT_MODEL_NAME: str = "meta-llama/llama-4-scout-17b-16e-instruct"
+    # Seconds per generated image, including the wait for one of the TTI_MAX_CONCURRENCY slots
+    TTI_TIMEOUT: float = 60.0
+    TTI_MAX_CONCURRENCY: int = 4
+    # Long WAV recordings are cut into segments of up to this length, at a pause between words,
+    # and the segments are transcribed in parallel
+    STT_SEGMENT_SECONDS: float = 30.0
+    # Synthesized speech is cached on disk for texts up to TTS_CACHE_MAX_TEXT_LENGTH characters
+    # when TTS_CACHE_PATH is set. Point it at a writable, persistent volume: on Cloud Run the
+    # container filesystem is in memory, so TTS_CACHE_MAX_BYTES counts against instance memory
+    TTS_CACHE_PATH: str | None = None
+    TTS_CACHE_MAX_BYTES: int = 256 * 1024 * 1024
+    TTS_CACHE_MAX_TEXT_LENGTH: int = 300
+
+    EMBEDDING_ENGINE: Literal["torch", "onnx", "onnx-int8"] = "torch"
+    # Precision of vectors stored in Qdrant; only applied when the collection is created
+    EMBEDDING_VECTOR_DTYPE: Literal["float32", "float16", "int8"] = "float32"
+    # "local" keeps the index in process memory and is single-process only (one uvicorn worker)
+    VECTOR_STORE_BACKEND: Literal["qdrant", "local"] = "qdrant"
+    VECTOR_STORE_PATH: str = "/app/data/vectors"
 
     MEMORY_TOP_K: int = 3
+    EMBEDDING_CACHE_SIZE: int = 4096
+    EMBEDDING_CACHE_DB_PATH: str | None = None
+    MEMORY_EXTRACTION_QUEUE_SIZE: int = 100
+    MEMORY_EXTRACTION_WORKERS: int = 2
+    MEMORY_EXTRACTION_MAX_RETRIES: int = 2
+    MEMORY_EXTRACTION_ENQUEUE_TIMEOUT: float = 0.1
     ROUTER_MESSAGES_TO_ANALYZE: int = 3
-    TOTAL_MESSAGES_SUMMARY_TRIGGER: int = 20
-    TOTAL_MESSAGES_AFTER_SUMMARY: int = 5
+    # Regex rules for explicit picture and voice requests, checked before the LLM router
+    ROUTER_FAST_PATH: bool = True
+    # Embedding centroid stage of the fast path; off until its thresholds are tuned with
+    # graph/utils/router_eval.py on real traffic
+    ROUTER_FAST_PATH_CENTROIDS: bool = False
+    # Cosine thresholds for the embedding fast path; below them the LLM router decides
+    ROUTER_FAST_PATH_MIN_SIMILARITY: float = 0.35
+    ROUTER_FAST_PATH_MIN_MARGIN: float = 0.1
+    # Short-term memory is summarized in the background once a thread exceeds the trigger,
+    # keeping the most recent SUMMARY_KEEP_TOKENS worth of messages verbatim
+    SUMMARY_TRIGGER_TOKENS: int = 3000
+    SUMMARY_KEEP_TOKENS: int = 1000
 
     SHORT_TERM_MEMORY_DB_PATH: str = "/app/data/memory.db"
+    GRAPH_DRAIN_TIMEOUT: float = 10.0
+    WARMUP_ON_STARTUP: bool = True
+
+    # "local" is for development; deployments with more than one instance or an ephemeral
+    # /app/data (Cloud Run) must use "supabase", which the deploy workflows set
+    MEDIA_STORE_BACKEND: Literal["local", "supabase"] = "local"
+    MEDIA_STORE_PATH: str = "/app/data/media"
+    MEDIA_STORE_BUCKET: str = "media"
+    # Media URLs are signed with MEDIA_URL_SECRET (default: SUPABASE_JWT_SECRET) and stay valid
+    # for between one and two MEDIA_URL_TTL_SECONDS
+    MEDIA_URL_SECRET: str | None = None
+    MEDIA_URL_TTL_SECONDS: int = 3600
+    # Media no message references is deleted once it is older than MEDIA_GC_GRACE_HOURS;
+    # the collection runs every MEDIA_GC_INTERVAL_HOURS (0 disables it)
+    MEDIA_GC_INTERVAL_HOURS: float = 24.0
+    MEDIA_GC_GRACE_HOURS: float = 24.0
+
+    # Generated images are re-encoded before they are stored
+    IMAGE_OUTPUT_FORMAT: Literal["webp", "jpeg", "png"] = "webp"
+    IMAGE_QUALITY: int = 85
+    IMAGE_MAX_DIMENSION: int = 1024
+    IMAGE_MAX_BYTES: int = 512 * 1024
+    IMAGE_PROCESSING_WORKERS: int = 2
 
 
 settings = Settings()
@@ -0,0 +1,12 @@
+import os
+
+# Settings require these at import time; the tests never call the services
+for name in [
+    "SUPABASE_URL",
+    "SUPABASE_KEY",
+    "GROQ_API_KEY",
+    "ELEVENLABS_API_KEY",
+    "ELEVENLABS_VOICE_ID",
+    "TOGETHER_API_KEY",
+]:
+    os.environ.setdefault(name, "test")
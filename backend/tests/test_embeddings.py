@@ -0,0 +1,37 @@
+import json
+import os
+
+import pytest
+
+from ai_companion.modules.memory.long_term.embeddings import load_embedding_model, top_k_agreement
+from ai_companion.modules.memory.long_term.vector_store import VectorStore
+
+CORPUS_PATH = os.path.join(os.path.dirname(__file__), "fixtures", "embedding_corpus.json")
+
+# Minimum mean top-k overlap with the torch engine on the fixed corpus
+MIN_AGREEMENT = {"onnx": 0.99, "onnx-int8": 0.9}
+
+
+@pytest.fixture(scope="module")
+def corpus():
+    with open(CORPUS_PATH, encoding="utf-8") as f:
+        return json.load(f)
+
+
+@pytest.fixture(scope="module")
+def reference():
+    return load_embedding_model(VectorStore.EMBEDDING_MODEL, "torch")
+
+
+# Weights that can't be downloaded fail the test, so the check can't go quiet by accident
+@pytest.mark.skipif(
+    bool(os.getenv("EMBEDDING_TESTS_OFFLINE")),
+    reason="Downloads the embedding model weights; unset EMBEDDING_TESTS_OFFLINE to run",
+)
+@pytest.mark.parametrize("engine", sorted(MIN_AGREEMENT))
+def test_onnx_engine_matches_torch_top_k(engine, reference, corpus):
+    candidate = load_embedding_model(VectorStore.EMBEDDING_MODEL, engine)
+    assert candidate.get_sentence_embedding_dimension() == reference.get_sentence_embedding_dimension()
+
+    agreement = top_k_agreement(reference, candidate, corpus["corpus"], corpus["queries"], k=3)
+    assert agreement >= MIN_AGREEMENT[engine], f"{engine} top-3 agreement with torch: {agreement:.3f}"
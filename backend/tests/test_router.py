@@ -0,0 +1,33 @@
+import asyncio
+import os
+
+import pytest
+
+from ai_companion.graph.utils.chains import FastRouter, get_fast_router
+from ai_companion.graph.utils.router_eval import evaluate_router, load_conversations
+
+FIXTURE_PATH = os.path.join(os.path.dirname(__file__), "fixtures", "router_eval.jsonl")
+
+
+@pytest.fixture(scope="module")
+def samples():
+    return load_conversations(FIXTURE_PATH)
+
+
+def test_rules_never_misroute_labeled_messages(samples):
+    rules = FastRouter(min_similarity=1.0, min_margin=1.0, use_centroids=False)
+    summary = asyncio.run(evaluate_router(samples, fast_router=rules, with_llm=False)).summary()
+
+    assert summary["fast_path_accuracy"] == 1.0, summary
+    assert summary["fast_path_coverage"] >= 0.3, summary
+
+
+@pytest.mark.skipif(
+    not os.getenv("ROUTER_EVAL_LLM"),
+    reason="Calls the LLM router and loads the embedding model; set ROUTER_EVAL_LLM=1",
+)
+def test_configured_router_against_llm(samples):
+    summary = asyncio.run(evaluate_router(samples, fast_router=get_fast_router())).summary()
+
+    assert summary["fast_path_accuracy"] is None or summary["fast_path_accuracy"] >= 0.95, summary
+    assert summary["pipeline_accuracy"] >= summary["llm_accuracy"] - 0.05, summary
@@ -89,6 +89,13 @@ function MessageItem({ message }: { message: Message }) {
   );
 }
 
+// Media is either a server URL (`/api/media/<sha256>`) or legacy inline base64
+function mediaSrc(media: string, mimeType: string) {
+  return media.startsWith('/api/media/')
+    ? `${process.env.NEXT_PUBLIC_API_BASE_URL}${media}`
+    : `data:${mimeType};base64,${media}`;
+}
+
 function renderMessageContent(message: Message) {
   switch (message.content.type) {
     case 'conversation':
@@ -97,7 +104,7 @@ function renderMessageContent(message: Message) {
     case 'image':
       // Handle both upload preview and server-processed image
       const imageUrl = message.image
-        ? `data:image/png;base64,${message.image}`
+        ? mediaSrc(message.image, 'image/png')
         : message.content.imageFile
           ? URL.createObjectURL(message.content.imageFile)
           : null;
@@ -127,7 +134,7 @@ function renderMessageContent(message: Message) {
               <source
                 src={
                   message.audio
-                    ? `data:audio/wav;base64,${message.audio}`
+                    ? mediaSrc(message.audio, 'audio/wav')
                     : URL.createObjectURL(message.content.audioFile)
                 }
               />